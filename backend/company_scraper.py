@@ -212,9 +212,10 @@ class CompanyCareerScraper:
             logger.error(f"Error scraping Apple Jobs: {e}")
             return []
     
-    def normalize_google_job(self, job: Dict) -> Optional[Dict]:
-        """Normalize Google job data"""
+    def normalize_google_job(self, job: Dict, now_iso: Optional[str] = None) -> Optional[Dict]:
+        """Normalize Google job data; now_iso lets a batch share one timestamp"""
         try:
+            now_iso = now_iso or datetime.now(timezone.utc).isoformat()
             locations = job.get("locations", [])
             location_str = locations[0].get("display", "USA") if locations else "USA"
             
@@ -239,18 +240,19 @@ class CompanyCareerScraper:
                 "state": state,
                 "base_salary": float(base_salary),
                 "job_description": job.get("description", "")[:5000],
-                "posted_date": job.get("posted_date", datetime.now(timezone.utc).isoformat()),
+                "posted_date": job.get("posted_date", now_iso),
                 "employment_type": "Full-time",
                 "is_external": True,
-                "last_synced": datetime.now(timezone.utc).isoformat()
+                "last_synced": now_iso
             }
         except Exception as e:
             logger.error(f"Error normalizing Google job: {e}")
             return None
     
-    def normalize_amazon_job(self, job: Dict) -> Optional[Dict]:
-        """Normalize Amazon job data"""
+    def normalize_amazon_job(self, job: Dict, now_iso: Optional[str] = None) -> Optional[Dict]:
+        """Normalize Amazon job data; now_iso lets a batch share one timestamp"""
         try:
+            now_iso = now_iso or datetime.now(timezone.utc).isoformat()
             location = job.get("city", "") + ", " + job.get("state", "WA")
             
             return {
@@ -265,18 +267,19 @@ class CompanyCareerScraper:
                 "state": job.get("state", "WA"),
                 "base_salary": 140000,  # Amazon average
                 "job_description": job.get("basic_qualifications", "")[:5000],
-                "posted_date": job.get("posted_date", datetime.now(timezone.utc).isoformat()),
+                "posted_date": job.get("posted_date", now_iso),
                 "employment_type": "Full-time",
                 "is_external": True,
-                "last_synced": datetime.now(timezone.utc).isoformat()
+                "last_synced": now_iso
             }
         except Exception as e:
             logger.error(f"Error normalizing Amazon job: {e}")
             return None
     
-    def normalize_microsoft_job(self, job: Dict) -> Optional[Dict]:
-        """Normalize Microsoft job data"""
+    def normalize_microsoft_job(self, job: Dict, now_iso: Optional[str] = None) -> Optional[Dict]:
+        """Normalize Microsoft job data; now_iso lets a batch share one timestamp"""
         try:
+            now_iso = now_iso or datetime.now(timezone.utc).isoformat()
             location = job.get("properties", {}).get("location", "Redmond, WA")
             state_match = re.search(r',\s*([A-Z]{2})', location)
             state = state_match.group(1) if state_match else "WA"
@@ -293,10 +296,10 @@ class CompanyCareerScraper:
                 "state": state,
                 "base_salary": 160000,  # Microsoft average
                 "job_description": job.get("description", "")[:5000],
-                "posted_date": job.get("postingDate", datetime.now(timezone.utc).isoformat()),
+                "posted_date": job.get("postingDate", now_iso),
                 "employment_type": "Full-time",
                 "is_external": True,
-                "last_synced": datetime.now(timezone.utc).isoformat()
+                "last_synced": now_iso
             }
         except Exception as e:
             logger.error(f"Error normalizing Microsoft job: {e}")
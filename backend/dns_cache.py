@@ -0,0 +1,135 @@
+"""
+DNS Cache
+httpx transport that resolves each host once per scraper run
+"""
+import asyncio
+import contextlib
+import socket
+from typing import AsyncIterator, Dict, List, Tuple
+import httpcore
+import httpx
+
+# httpcore errors raised while sending or streaming, translated to the httpx errors
+# callers catch; the most specific class in an error's MRO wins
+HTTPCORE_EXCEPTIONS = {
+    httpcore.TimeoutException: httpx.TimeoutException,
+    httpcore.ConnectTimeout: httpx.ConnectTimeout,
+    httpcore.ReadTimeout: httpx.ReadTimeout,
+    httpcore.WriteTimeout: httpx.WriteTimeout,
+    httpcore.PoolTimeout: httpx.PoolTimeout,
+    httpcore.NetworkError: httpx.NetworkError,
+    httpcore.ConnectError: httpx.ConnectError,
+    httpcore.ReadError: httpx.ReadError,
+    httpcore.WriteError: httpx.WriteError,
+    httpcore.ProxyError: httpx.ProxyError,
+    httpcore.UnsupportedProtocol: httpx.UnsupportedProtocol,
+    httpcore.ProtocolError: httpx.ProtocolError,
+    httpcore.LocalProtocolError: httpx.LocalProtocolError,
+    httpcore.RemoteProtocolError: httpx.RemoteProtocolError,
+}
+
+@contextlib.contextmanager
+def map_httpcore_exceptions():
+    """Re-raise httpcore errors as their httpx equivalents"""
+    try:
+        yield
+    except Exception as e:
+        for cls in type(e).__mro__:
+            if cls in HTTPCORE_EXCEPTIONS:
+                raise HTTPCORE_EXCEPTIONS[cls](str(e)) from e
+        raise
+
+class CachingDNSBackend(httpcore.AsyncNetworkBackend):
+    """Network backend that memoizes host lookups and delegates everything else"""
+
+    def __init__(self):
+        self.backend = httpcore.AnyIOBackend()
+        self.addresses: Dict[Tuple[str, int], List[str]] = {}
+
+    async def resolve(self, host: str, port: int) -> List[str]:
+        """Resolve a host to its IP addresses, asking the resolver only the first time"""
+        addresses = self.addresses.get((host, port))
+        if addresses is None:
+            try:
+                infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            except socket.gaierror as e:
+                raise httpcore.ConnectError(str(e)) from e
+            # Keep every address in resolver order, without duplicates
+            addresses = self.addresses[(host, port)] = list(dict.fromkeys(info[4][0] for info in infos))
+        return addresses
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        # Addresses are tried in turn, so an unreachable one (e.g. IPv6 on an IPv4-only
+        # network) falls through to the next. TLS still verifies and sends SNI for the
+        # original hostname, taken from the request URL.
+        error = None
+        for address in await self.resolve(host, port):
+            try:
+                return await self.backend.connect_tcp(address, port, timeout, local_address, socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+        raise error
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self.backend.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self.backend.sleep(seconds)
+
+class ResponseStream(httpx.AsyncByteStream):
+    """httpx body stream over an httpcore response stream"""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        with map_httpcore_exceptions():
+            async for part in self.stream:
+                yield part
+
+    async def aclose(self) -> None:
+        if hasattr(self.stream, 'aclose'):
+            await self.stream.aclose()
+
+class CachingDNSTransport(httpx.AsyncBaseTransport):
+    """httpx transport over a connection pool whose connections share one DNS cache"""
+
+    def __init__(self, http2: bool = False, limits: httpx.Limits = httpx.Limits()):
+        self.pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            http2=http2,
+            network_backend=CachingDNSBackend()
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path
+            ),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions
+        )
+        with map_httpcore_exceptions():
+            response = await self.pool.handle_async_request(core_request)
+
+        return httpx.Response(
+            status_code=response.status,
+            headers=response.headers,
+            stream=ResponseStream(response.stream),
+            extensions=response.extensions
+        )
+
+    async def aclose(self) -> None:
+        await self.pool.aclose()
+
+def cached_dns_transport(**kwargs) -> CachingDNSTransport:
+    """Create an httpx transport whose connections share one DNS cache"""
+    return CachingDNSTransport(**kwargs)
@@ -138,7 +138,8 @@ async def import_opt_employers():
     for employer in OPT_EMPLOYERS:
         # Try to find existing company
         existing = await db.companies.find_one(
-            {"name": {"$regex": employer['name'], "$options": "i"}}
+            {"name": {"$regex": employer['name'], "$options": "i"}},
+            {"_id": 1}
         )
         
         if existing:
@@ -5,42 +5,194 @@ Fetches jobs from multiple public APIs and filters for H1B-sponsoring companies
 import httpx
 import logging
 import os
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 import asyncio
+import random
 import re
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 from wage_predictor import wage_predictor
 from company_scraper import company_scraper
+from rate_limiter import AsyncRateLimiter
 
 logger = logging.getLogger(__name__)
 
+# Number of upserts sent to MongoDB per bulk_write call during a sync
+SYNC_WRITE_BATCH_SIZE = 500
+# Normalized jobs buffered between the provider fetchers and the writer
+SYNC_QUEUE_SIZE = 2000
+
+# Transient provider responses that are retried with exponential backoff
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503)
+RETRY_MAX_ATTEMPTS = 4
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+
+# Map Greenhouse board tokens to proper company names
+GREENHOUSE_BOARD_COMPANIES = {
+    "gitlab": "GitLab",
+    "stripe": "Stripe",
+    "airbnb": "Airbnb",
+    "lyft": "Lyft",
+    "dropbox": "Dropbox",
+    "coinbase": "Coinbase",
+    "square": "Square",
+    "robinhood": "Robinhood",
+    "doordash": "DoorDash",
+    "instacart": "Instacart",
+    "reddit": "Reddit",
+    "databricks": "Databricks",
+    "snowflake": "Snowflake",
+    "mongodb": "MongoDB",
+    "plaid": "Plaid",
+    "notion": "Notion",
+    "figma": "Figma",
+    "airtable": "Airtable",
+    "asana": "Asana",
+    "cloudflare": "Cloudflare",
+}
+
+# Common US state abbreviations
+US_STATE_CODES = (
+    "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA",
+    "HI", "ID", "IL", "IN", "IA", "KS", "KY", "LA", "ME", "MD",
+    "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ",
+    "NM", "NY", "NC", "ND", "OH", "OK", "OR", "PA", "RI", "SC",
+    "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY"
+)
+
+@dataclass(slots=True)
+class NormalizedJob:
+    """Job record in our schema, kept as a slotted object until it is persisted"""
+    job_id: str
+    external_id: str
+    source: str
+    external_url: str
+    job_title: str
+    company_name: str
+    company_id: str
+    location: str
+    state: str
+    job_description: str
+    posted_date: str
+    last_synced: str
+    wage_level: int = 2
+    base_salary: float = 0
+    prevailing_wage: float = 0
+    requirements: List[str] = field(default_factory=list)
+    benefits: List[str] = field(default_factory=list)
+    visa_sponsorship: bool = True
+    employment_type: str = "Full-time"
+    lca_case_number: Optional[str] = None
+    is_external: bool = True
+    
+    def to_document(self) -> Dict:
+        """Convert to a MongoDB document"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
 class JobAggregator:
     """Aggregates jobs from multiple sources"""
     
     def __init__(self, db):
         self.db = db
         self.http_client = httpx.AsyncClient(timeout=30.0)
+        # Per-provider request budgets to avoid rate limiting
+        self.jsearch_limiter = AsyncRateLimiter(2, 1.0)
+        self.adzuna_limiter = AsyncRateLimiter(3, 1.0)
+        # ISO timestamp shared by every job normalized during the current sync
+        self.sync_timestamp = datetime.now(timezone.utc).isoformat()
+        # Known H1B company names keyed by each 4-character shingle they contain,
+        # and by their leading shingle (both built in get_h1b_companies)
+        self.h1b_shingle_index = {}
+        self.h1b_prefix_index = {}
+        # Sponsor verdicts by raw company name, valid until the indexes are rebuilt
+        self.h1b_sponsor_cache = {}
+        self.reload_credentials()
         
+    def reload_credentials(self):
+        """Read provider API credentials from the environment"""
+        self.jsearch_api_key = os.environ.get("JSEARCH_API_KEY")
+        self.adzuna_app_id = os.environ.get("ADZUNA_APP_ID")
+        self.adzuna_app_key = os.environ.get("ADZUNA_APP_KEY")
+        self.usajobs_api_key = os.environ.get("USAJOBS_API_KEY")
+    
     async def close(self):
         """Close HTTP client"""
         await self.http_client.aclose()
     
+    async def ensure_indexes(self):
+        """Create the indexes the sync upserts rely on"""
+        try:
+            await self.db.jobs.create_index("job_id", unique=True)
+            await self.db.jobs.create_index("source")
+            # Internal jobs have no source/external_id, so only external jobs are indexed
+            await self.db.jobs.create_index(
+                [("source", 1), ("external_id", 1)],
+                unique=True,
+                partialFilterExpression={"is_external": True}
+            )
+        except Exception as e:
+            logger.error(f"Error creating job indexes: {e}")
+    
+    async def _get(self, url: str, limiter: Optional[AsyncRateLimiter] = None, **kwargs) -> httpx.Response:
+        """GET with retries on 429/5xx and transport errors, honoring Retry-After"""
+        for attempt in range(1, RETRY_MAX_ATTEMPTS + 1):
+            try:
+                if limiter:
+                    async with limiter:
+                        response = await self.http_client.get(url, **kwargs)
+                else:
+                    response = await self.http_client.get(url, **kwargs)
+            except httpx.TransportError:
+                if attempt == RETRY_MAX_ATTEMPTS:
+                    raise
+                response = None
+            
+            if response is not None and response.status_code not in RETRYABLE_STATUS_CODES:
+                return response
+            if attempt == RETRY_MAX_ATTEMPTS:
+                return response
+            
+            # Exponential backoff with jitter, unless the server tells us how long to wait
+            delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1)) + random.uniform(0, RETRY_BASE_DELAY)
+            retry_after = response.headers.get("Retry-After") if response is not None else None
+            if retry_after and retry_after.isdigit():
+                delay = min(RETRY_MAX_DELAY, float(retry_after))
+            
+            status = response.status_code if response is not None else "transport error"
+            logger.warning(f"Retrying {url} after {status} (attempt {attempt}/{RETRY_MAX_ATTEMPTS}, waiting {delay:.1f}s)")
+            await asyncio.sleep(delay)
+    
     async def get_h1b_companies(self) -> set:
         """Get list of H1B-sponsoring company names from database"""
         try:
-            companies = await self.db.companies.find({}, {"_id": 0, "name": 1}).to_list(None)
+            # Stream names off the cursor instead of materializing every company doc
+            cursor = self.db.companies.find({}, {"_id": 0, "name": 1}).batch_size(1000)
             # Create set of normalized company names for matching
             company_names = set()
-            for comp in companies:
-                name = comp.get("name", "").lower().strip()
+            async for comp in cursor:
+                name = (comp.get("name") or "").lower().strip()
                 if name:
                     normalized = self.normalize_company_name(name)
                     company_names.add(normalized)
                     # Also add the original (in case it's already clean)
                     company_names.add(name)
             
+            # Index names by shingle so is_h1b_sponsor only checks plausible partial matches
+            self.h1b_shingle_index = {}
+            self.h1b_prefix_index = {}
+            self.h1b_sponsor_cache = {}
+            for name in company_names:
+                if len(name) < 4:
+                    continue
+                for shingle in self.name_shingles(name):
+                    self.h1b_shingle_index.setdefault(shingle, set()).add(name)
+                self.h1b_prefix_index.setdefault(name[:4], set()).add(name)
+            
             logger.info(f"Loaded {len(company_names)} H1B-sponsoring company name variations")
-            return company_names
+            return frozenset(company_names)
         except Exception as e:
             logger.error(f"Error loading H1B companies: {e}")
             return set()
@@ -75,11 +227,24 @@ class JobAggregator:
         
         return name
     
+    def name_shingles(self, name: str) -> set:
+        """Get the overlapping 4-character substrings of a company name"""
+        return {name[i:i + 4] for i in range(len(name) - 3)}
+    
     def is_h1b_sponsor(self, company_name: str, h1b_companies: set) -> bool:
-        """Check if company sponsors H1B - uses flexible matching"""
+        """Check if company sponsors H1B, reusing the verdict for repeated employer names"""
         if not company_name:
             return False
-            
+        
+        # Providers return many postings per employer, so only match each name once per sync
+        verdict = self.h1b_sponsor_cache.get(company_name)
+        if verdict is None:
+            verdict = self.match_h1b_sponsor(company_name, h1b_companies)
+            self.h1b_sponsor_cache[company_name] = verdict
+        return verdict
+    
+    def match_h1b_sponsor(self, company_name: str, h1b_companies: set) -> bool:
+        """Check if company sponsors H1B - uses flexible matching"""
         # Try exact match first
         normalized = self.normalize_company_name(company_name)
         if normalized in h1b_companies:
@@ -89,16 +254,32 @@ class JobAggregator:
         if company_name.lower().strip() in h1b_companies:
             return True
         
+        if len(normalized) < 4:  # Avoid very short matches
+            return False
+        
+        # Any partial match shares at least one shingle with the normalized name,
+        # so a name with no known shingle can be rejected immediately
+        shingles = self.name_shingles(normalized)
+        postings = [self.h1b_shingle_index[shingle] for shingle in shingles if shingle in self.h1b_shingle_index]
+        if not postings:
+            return False
+        
         # Try partial match - if normalized name is a substring of any H1B company
-        # or vice versa (for companies like "Google" vs "Google LLC")
-        for h1b_company in h1b_companies:
-            if len(normalized) >= 4 and len(h1b_company) >= 4:  # Avoid very short matches
-                if normalized in h1b_company or h1b_company in normalized:
-                    # Additional check: the match should be substantial (at least 70% of the shorter name)
-                    shorter = min(len(normalized), len(h1b_company))
-                    longer = max(len(normalized), len(h1b_company))
-                    if shorter / longer >= 0.7:
-                        return True
+        # or vice versa (for companies like "Google" vs "Google LLC").
+        # A company containing the name holds every one of its shingles, so the
+        # rarest shingle's postings cover that case; a company contained in the
+        # name starts with one of the name's shingles.
+        candidates = set(min(postings, key=len)) if len(postings) == len(shingles) else set()
+        for shingle in shingles:
+            candidates.update(self.h1b_prefix_index.get(shingle, ()))
+        
+        for h1b_company in candidates:
+            if normalized in h1b_company or h1b_company in normalized:
+                # Additional check: the match should be substantial (at least 70% of the shorter name)
+                shorter = min(len(normalized), len(h1b_company))
+                longer = max(len(normalized), len(h1b_company))
+                if shorter / longer >= 0.7:
+                    return True
         
         return False
     
@@ -106,7 +287,7 @@ class JobAggregator:
         """Fetch jobs from Arbeitnow API (no auth required)"""
         try:
             logger.info("Fetching jobs from Arbeitnow...")
-            response = await self.http_client.get("https://www.arbeitnow.com/api/job-board-api")
+            response = await self._get("https://www.arbeitnow.com/api/job-board-api")
             
             if response.status_code == 200:
                 data = response.json()
@@ -143,7 +324,7 @@ class JobAggregator:
                 "Page": "1"
             }
             
-            response = await self.http_client.get(
+            response = await self._get(
                 "https://data.usajobs.gov/api/search",
                 headers=headers,
                 params=params
@@ -195,8 +376,9 @@ class JobAggregator:
                         "date_posted": "month"  # Jobs from last month
                     }
                     
-                    response = await self.http_client.get(
+                    response = await self._get(
                         "https://jsearch.p.rapidapi.com/search",
+                        limiter=self.jsearch_limiter,
                         headers=headers,
                         params=params
                     )
@@ -209,9 +391,6 @@ class JobAggregator:
                     else:
                         logger.warning(f"JSearch API error for query '{query}': {response.status_code}")
                     
-                    # Small delay to avoid rate limiting
-                    await asyncio.sleep(0.5)
-                    
                 except Exception as e:
                     logger.error(f"Error fetching JSearch query '{query}': {e}")
                     continue
@@ -257,8 +436,9 @@ class JobAggregator:
                         "content-type": "application/json"
                     }
                     
-                    response = await self.http_client.get(
+                    response = await self._get(
                         "https://api.adzuna.com/v1/api/jobs/us/search/1",
+                        limiter=self.adzuna_limiter,
                         params=params
                     )
                     
@@ -270,9 +450,6 @@ class JobAggregator:
                     else:
                         logger.warning(f"Adzuna API error: {response.status_code}")
                     
-                    # Delay to respect rate limits
-                    await asyncio.sleep(0.3)
-                    
                 except Exception as e:
                     logger.error(f"Error fetching Adzuna search {search}: {e}")
                     continue
@@ -292,7 +469,7 @@ class JobAggregator:
             try:
                 logger.info(f"Fetching jobs from Greenhouse board: {token[:10]}...")
                 url = f"https://boards-api.greenhouse.io/v1/boards/{token}/jobs?content=true"
-                response = await self.http_client.get(url)
+                response = await self._get(url)
                 
                 if response.status_code == 200:
                     data = response.json()
@@ -312,7 +489,7 @@ class JobAggregator:
         logger.info(f"Total Greenhouse jobs fetched: {len(all_jobs)}")
         return all_jobs
     
-    def normalize_arbeitnow_job(self, job: Dict, h1b_companies: set) -> Optional[Dict]:
+    def normalize_arbeitnow_job(self, job: Dict, h1b_companies: set) -> Optional[NormalizedJob]:
         """Normalize Arbeitnow job to our schema"""
         try:
             company_name = job.get("company_name", "")
@@ -328,67 +505,46 @@ class JobAggregator:
             location = job.get("location", "Remote")
             state = self.extract_state(location)
             
+            # Limit length before extracting requirements
+            description = job.get("description", "")[:5000]
+            
             # Normalize job data
-            normalized = {
-                "job_id": f"arbeit_{job.get('slug', '')}",
-                "external_id": job.get("slug", ""),
-                "source": "arbeitnow",
-                "external_url": job.get("url", ""),
-                "job_title": job.get("title", ""),
-                "company_name": company_name,
-                "company_id": f"comp_{self.normalize_company_name(company_name).replace(' ', '_')}",
-                "location": location,
-                "state": state,
-                "wage_level": 2,  # Default to level 2
-                "base_salary": 0,  # Not provided by Arbeitnow
-                "prevailing_wage": 0,
-                "job_description": job.get("description", "")[:5000],  # Limit length
-                "requirements": self.extract_requirements(job.get("description", "")),
-                "benefits": [],
-                "visa_sponsorship": True,
-                "posted_date": self.parse_date(job.get("created_at")),
-                "employment_type": job.get("job_types", ["Full-time"])[0] if job.get("job_types") else "Full-time",
-                "lca_case_number": None,
-                "is_external": True,
-                "last_synced": datetime.now(timezone.utc).isoformat()
-            }
+            normalized = NormalizedJob(
+                job_id=f"arbeit_{job.get('slug', '')}",
+                external_id=job.get("slug", ""),
+                source="arbeitnow",
+                external_url=job.get("url", ""),
+                job_title=job.get("title", ""),
+                company_name=company_name,
+                company_id=f"comp_{self.normalize_company_name(company_name).replace(' ', '_')}",
+                location=location,
+                state=state,
+                wage_level=2,  # Default to level 2
+                base_salary=0,  # Not provided by Arbeitnow
+                prevailing_wage=0,
+                job_description=description,
+                requirements=self.extract_requirements(description),
+                benefits=[],
+                visa_sponsorship=True,
+                posted_date=self.parse_date(job.get("created_at")),
+                employment_type=job.get("job_types", ["Full-time"])[0] if job.get("job_types") else "Full-time",
+                lca_case_number=None,
+                is_external=True,
+                last_synced=self.sync_timestamp
+            )
             
             return normalized
         except Exception as e:
             logger.error(f"Error normalizing Arbeitnow job: {e}")
             return None
     
-    def normalize_greenhouse_job(self, job: Dict, h1b_companies: set) -> Optional[Dict]:
+    def normalize_greenhouse_job(self, job: Dict, h1b_companies: set) -> Optional[NormalizedJob]:
         """Normalize Greenhouse job to our schema"""
         try:
             # Greenhouse doesn't include company name in JSON, derive from board_token
             board_token = job.get("board_token", "")
             
-            # Map board tokens to proper company names
-            token_to_company = {
-                "gitlab": "GitLab",
-                "stripe": "Stripe",
-                "airbnb": "Airbnb",
-                "lyft": "Lyft",
-                "dropbox": "Dropbox",
-                "coinbase": "Coinbase",
-                "square": "Square",
-                "robinhood": "Robinhood",
-                "doordash": "DoorDash",
-                "instacart": "Instacart",
-                "reddit": "Reddit",
-                "databricks": "Databricks",
-                "snowflake": "Snowflake",
-                "mongodb": "MongoDB",
-                "plaid": "Plaid",
-                "notion": "Notion",
-                "figma": "Figma",
-                "airtable": "Airtable",
-                "asana": "Asana",
-                "cloudflare": "Cloudflare",
-            }
-            
-            company_name = token_to_company.get(board_token.lower(), board_token.title())
+            company_name = GREENHOUSE_BOARD_COMPANIES.get(board_token.lower(), board_token.title())
             
             # Filter for H1B sponsors
             if not self.is_h1b_sponsor(company_name, h1b_companies):
@@ -408,7 +564,7 @@ class JobAggregator:
             
             # Get job content
             content = job.get("content", {}) or {}
-            description = content.get("description", "") if isinstance(content, dict) else ""
+            description = content.get("description", "")[:5000] if isinstance(content, dict) else ""
             
             job_title = job.get("title", "")
             
@@ -417,36 +573,36 @@ class JobAggregator:
             base_salary = 0
             wage_level = wage_predictor.predict_wage_level(job_title, state, base_salary)
             
-            normalized = {
-                "job_id": f"gh_{job.get('id', '')}",
-                "external_id": str(job.get("id", "")),
-                "source": "greenhouse",
-                "external_url": job.get("absolute_url", ""),
-                "job_title": job_title,
-                "company_name": company_name,
-                "company_id": f"comp_{self.normalize_company_name(company_name).replace(' ', '_')}",
-                "location": location,
-                "state": state,
-                "wage_level": wage_level,  # AI-predicted
-                "base_salary": float(base_salary) if base_salary else 0,
-                "prevailing_wage": 0,
-                "job_description": description[:5000],
-                "requirements": self.extract_requirements(description),
-                "benefits": [],
-                "visa_sponsorship": True,
-                "posted_date": self.parse_date(job.get("updated_at")),
-                "employment_type": "Full-time",
-                "lca_case_number": None,
-                "is_external": True,
-                "last_synced": datetime.now(timezone.utc).isoformat()
-            }
+            normalized = NormalizedJob(
+                job_id=f"gh_{job.get('id', '')}",
+                external_id=str(job.get("id", "")),
+                source="greenhouse",
+                external_url=job.get("absolute_url", ""),
+                job_title=job_title,
+                company_name=company_name,
+                company_id=f"comp_{self.normalize_company_name(company_name).replace(' ', '_')}",
+                location=location,
+                state=state,
+                wage_level=wage_level,  # AI-predicted
+                base_salary=float(base_salary) if base_salary else 0,
+                prevailing_wage=0,
+                job_description=description,
+                requirements=self.extract_requirements(description),
+                benefits=[],
+                visa_sponsorship=True,
+                posted_date=self.parse_date(job.get("updated_at")),
+                employment_type="Full-time",
+                lca_case_number=None,
+                is_external=True,
+                last_synced=self.sync_timestamp
+            )
             
             return normalized
         except Exception as e:
             logger.error(f"Error normalizing Greenhouse job: {e}")
             return None
     
-    def normalize_usajobs_job(self, job_item: Dict, h1b_companies: set) -> Optional[Dict]:
+    def normalize_usajobs_job(self, job_item: Dict, h1b_companies: set) -> Optional[NormalizedJob]:
         """Normalize USAJOBS job to our schema"""
         try:
             # USAJOBS wraps data in MatchedObjectDescriptor
@@ -478,36 +634,36 @@ class JobAggregator:
             # Get application URL
             apply_url = job.get("PositionURI", "")
             
-            normalized = {
-                "job_id": f"usa_{job.get('PositionID', '')}",
-                "external_id": job.get("PositionID", ""),
-                "source": "usajobs",
-                "external_url": apply_url,
-                "job_title": job.get("PositionTitle", ""),
-                "company_name": org_name,
-                "company_id": f"comp_us_gov",
-                "location": location,
-                "state": state,
-                "wage_level": 2,  # Default
-                "base_salary": float(base_salary),
-                "prevailing_wage": 0,
-                "job_description": (job.get("UserArea", {}).get("Details", {}).get("JobSummary", ""))[:5000],
-                "requirements": self.extract_requirements(job.get("QualificationSummary", "")),
-                "benefits": [],
-                "visa_sponsorship": False,  # Government jobs typically don't sponsor
-                "posted_date": self.parse_date(job.get("PublicationStartDate")),
-                "employment_type": job.get("PositionSchedule", [{}])[0].get("Name", "Full-time") if job.get("PositionSchedule") else "Full-time",
-                "lca_case_number": None,
-                "is_external": True,
-                "last_synced": datetime.now(timezone.utc).isoformat()
-            }
+            normalized = NormalizedJob(
+                job_id=f"usa_{job.get('PositionID', '')}",
+                external_id=job.get("PositionID", ""),
+                source="usajobs",
+                external_url=apply_url,
+                job_title=job.get("PositionTitle", ""),
+                company_name=org_name,
+                company_id=f"comp_us_gov",
+                location=location,
+                state=state,
+                wage_level=2,  # Default
+                base_salary=float(base_salary),
+                prevailing_wage=0,
+                job_description=(job.get("UserArea", {}).get("Details", {}).get("JobSummary", ""))[:5000],
+                requirements=self.extract_requirements(job.get("QualificationSummary", "")[:5000]),
+                benefits=[],
+                visa_sponsorship=False,  # Government jobs typically don't sponsor
+                posted_date=self.parse_date(job.get("PublicationStartDate")),
+                employment_type=job.get("PositionSchedule", [{}])[0].get("Name", "Full-time") if job.get("PositionSchedule") else "Full-time",
+                lca_case_number=None,
+                is_external=True,
+                last_synced=self.sync_timestamp
+            )
             
             return normalized
         except Exception as e:
             logger.error(f"Error normalizing USAJOBS job: {e}")
             return None
     
-    def normalize_jsearch_job(self, job: Dict, h1b_companies: set) -> Optional[Dict]:
+    def normalize_jsearch_job(self, job: Dict, h1b_companies: set) -> Optional[NormalizedJob]:
         """Normalize JSearch/Google Jobs to our schema"""
         try:
             employer_name = job.get("employer_name", "")
@@ -540,40 +696,41 @@ class JobAggregator:
                 base_salary = salary_max
             
             job_title = job.get("job_title", "")
+            description = job.get("job_description", "")[:5000]
             
             # AI-powered wage level prediction
             wage_level = wage_predictor.predict_wage_level(job_title, state, base_salary)
             
-            normalized = {
-                "job_id": f"js_{job.get('job_id', '')}",
-                "external_id": job.get("job_id", ""),
-                "source": "jsearch",
-                "external_url": job.get("job_apply_link", job.get("job_google_link", "")),
-                "job_title": job_title,
-                "company_name": employer_name,
-                "company_id": f"comp_{self.normalize_company_name(employer_name).replace(' ', '_')}",
-                "location": location,
-                "state": state or self.extract_state(location),
-                "wage_level": wage_level,  # AI-predicted
-                "base_salary": float(base_salary) if base_salary else 0,
-                "prevailing_wage": 0,
-                "job_description": job.get("job_description", "")[:5000],
-                "requirements": self.extract_requirements(job.get("job_description", "")),
-                "benefits": job.get("job_highlights", {}).get("Benefits", [])[:5] if job.get("job_highlights") else [],
-                "visa_sponsorship": job.get("job_is_remote", False),
-                "posted_date": self.parse_date(job.get("job_posted_at_datetime_utc")),
-                "employment_type": job.get("job_employment_type", "Full-time"),
-                "lca_case_number": None,
-                "is_external": True,
-                "last_synced": datetime.now(timezone.utc).isoformat()
-            }
+            normalized = NormalizedJob(
+                job_id=f"js_{job.get('job_id', '')}",
+                external_id=job.get("job_id", ""),
+                source="jsearch",
+                external_url=job.get("job_apply_link", job.get("job_google_link", "")),
+                job_title=job_title,
+                company_name=employer_name,
+                company_id=f"comp_{self.normalize_company_name(employer_name).replace(' ', '_')}",
+                location=location,
+                state=state or self.extract_state(location),
+                wage_level=wage_level,  # AI-predicted
+                base_salary=float(base_salary) if base_salary else 0,
+                prevailing_wage=0,
+                job_description=description,
+                requirements=self.extract_requirements(description),
+                benefits=job.get("job_highlights", {}).get("Benefits", [])[:5] if job.get("job_highlights") else [],
+                visa_sponsorship=job.get("job_is_remote", False),
+                posted_date=self.parse_date(job.get("job_posted_at_datetime_utc")),
+                employment_type=job.get("job_employment_type", "Full-time"),
+                lca_case_number=None,
+                is_external=True,
+                last_synced=self.sync_timestamp
+            )
             
             return normalized
         except Exception as e:
             logger.error(f"Error normalizing JSearch job: {e}")
             return None
     
-    def normalize_adzuna_job(self, job: Dict, h1b_companies: set) -> Optional[Dict]:
+    def normalize_adzuna_job(self, job: Dict, h1b_companies: set) -> Optional[NormalizedJob]:
         """Normalize Adzuna job to our schema"""
         try:
             company_name = job.get("company", {}).get("display_name", "") if isinstance(job.get("company"), dict) else ""
@@ -601,33 +758,34 @@ class JobAggregator:
                 base_salary = salary_max
             
             job_title = job.get("title", "")
+            description = job.get("description", "")[:5000]
             
             # AI-powered wage level prediction
             wage_level = wage_predictor.predict_wage_level(job_title, state, base_salary)
             
-            normalized = {
-                "job_id": f"adz_{job.get('id', '')}",
-                "external_id": str(job.get("id", "")),
-                "source": "adzuna",
-                "external_url": job.get("redirect_url", ""),
-                "job_title": job_title,
-                "company_name": company_name,
-                "company_id": f"comp_{self.normalize_company_name(company_name).replace(' ', '_')}",
-                "location": location_area,
-                "state": state or self.extract_state(location_area),
-                "wage_level": wage_level,  # AI-predicted
-                "base_salary": float(base_salary) if base_salary else 0,
-                "prevailing_wage": 0,
-                "job_description": job.get("description", "")[:5000],
-                "requirements": self.extract_requirements(job.get("description", "")),
-                "benefits": [],
-                "visa_sponsorship": True,
-                "posted_date": self.parse_date(job.get("created")),
-                "employment_type": job.get("contract_type", "Full-time"),
-                "lca_case_number": None,
-                "is_external": True,
-                "last_synced": datetime.now(timezone.utc).isoformat()
-            }
+            normalized = NormalizedJob(
+                job_id=f"adz_{job.get('id', '')}",
+                external_id=str(job.get("id", "")),
+                source="adzuna",
+                external_url=job.get("redirect_url", ""),
+                job_title=job_title,
+                company_name=company_name,
+                company_id=f"comp_{self.normalize_company_name(company_name).replace(' ', '_')}",
+                location=location_area,
+                state=state or self.extract_state(location_area),
+                wage_level=wage_level,  # AI-predicted
+                base_salary=float(base_salary) if base_salary else 0,
+                prevailing_wage=0,
+                job_description=description,
+                requirements=self.extract_requirements(description),
+                benefits=[],
+                visa_sponsorship=True,
+                posted_date=self.parse_date(job.get("created")),
+                employment_type=job.get("contract_type", "Full-time"),
+                lca_case_number=None,
+                is_external=True,
+                last_synced=self.sync_timestamp
+            )
             
             return normalized
         except Exception as e:
@@ -639,18 +797,9 @@ class JobAggregator:
         if not location:
             return "Remote"
         
-        # Common US state abbreviations
-        states = {
-            "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA",
-            "HI", "ID", "IL", "IN", "IA", "KS", "KY", "LA", "ME", "MD",
-            "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ",
-            "NM", "NY", "NC", "ND", "OH", "OK", "OR", "PA", "RI", "SC",
-            "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY"
-        }
-        
         # Try to find state abbreviation
         location_upper = location.upper()
-        for state in states:
+        for state in US_STATE_CODES:
             if f" {state}" in f" {location_upper}" or location_upper.endswith(state):
                 return state
         
@@ -683,7 +832,7 @@ class JobAggregator:
     def parse_date(self, date_str) -> str:
         """Parse date string to ISO format"""
         if not date_str:
-            return datetime.now(timezone.utc).isoformat()
+            return self.sync_timestamp
         
         try:
             if isinstance(date_str, str):
@@ -693,7 +842,126 @@ class JobAggregator:
         except:
             pass
         
-        return datetime.now(timezone.utc).isoformat()
+        return self.sync_timestamp
+    
+    async def _scrape_company_careers(self, company: str, scrape, normalize) -> List[NormalizedJob]:
+        """Scrape a company career site and normalize its jobs with predicted wage levels"""
+        normalized_jobs = []
+        try:
+            for job in await scrape():
+                normalized = normalize(job, self.sync_timestamp)
+                if normalized:
+                    normalized = NormalizedJob(**normalized)
+                    # Add wage level prediction
+                    normalized.wage_level = wage_predictor.predict_wage_level(
+                        normalized.job_title,
+                        normalized.state,
+                        normalized.base_salary
+                    )
+                    normalized_jobs.append(normalized)
+        except Exception as e:
+            logger.error(f"Error scraping {company}: {e}")
+        return normalized_jobs
+    
+    async def _fetch_and_normalize_arbeitnow(self, h1b_companies: set) -> List[NormalizedJob]:
+        """Fetch and normalize Arbeitnow jobs"""
+        normalized_jobs = []
+        for job in await self.fetch_arbeitnow_jobs():
+            normalized = self.normalize_arbeitnow_job(job, h1b_companies)
+            if normalized:
+                normalized_jobs.append(normalized)
+        return normalized_jobs
+    
+    async def _fetch_and_normalize_jsearch(self, api_key: str, h1b_companies: set) -> List[NormalizedJob]:
+        """Fetch and normalize JSearch jobs"""
+        normalized_jobs = []
+        for job in await self.fetch_jsearch_jobs(api_key):
+            normalized = self.normalize_jsearch_job(job, h1b_companies)
+            if normalized:
+                normalized_jobs.append(normalized)
+        return normalized_jobs
+    
+    async def _fetch_and_normalize_adzuna(self, app_id: str, app_key: str, h1b_companies: set) -> List[NormalizedJob]:
+        """Fetch and normalize Adzuna jobs"""
+        normalized_jobs = []
+        for job in await self.fetch_adzuna_jobs(app_id, app_key):
+            normalized = self.normalize_adzuna_job(job, h1b_companies)
+            if normalized:
+                normalized_jobs.append(normalized)
+        return normalized_jobs
+    
+    async def _fetch_and_normalize_usajobs(self, api_key: str, h1b_companies: set) -> List[NormalizedJob]:
+        """Fetch and normalize USAJOBS jobs"""
+        normalized_jobs = []
+        for job in await self.fetch_usajobs(api_key):
+            normalized = self.normalize_usajobs_job(job, h1b_companies)
+            if normalized:
+                normalized_jobs.append(normalized)
+        return normalized_jobs
+    
+    async def _fetch_and_normalize_greenhouse(self, board_tokens: List[str], h1b_companies: set) -> List[NormalizedJob]:
+        """Fetch and normalize Greenhouse jobs"""
+        normalized_jobs = []
+        for job in await self.fetch_greenhouse_jobs(board_tokens):
+            normalized = self.normalize_greenhouse_job(job, h1b_companies)
+            if normalized:
+                normalized_jobs.append(normalized)
+        return normalized_jobs
+    
+    async def _enqueue_jobs(self, fetcher, queue: asyncio.Queue):
+        """Await a provider fetcher and queue its normalized jobs for writing"""
+        try:
+            for job in await fetcher:
+                await queue.put(job)
+        except Exception as e:
+            logger.error(f"Error fetching provider jobs: {e}")
+    
+    async def _write_jobs(self, queue: asyncio.Queue) -> Tuple[int, int]:
+        """Drain queued jobs into batched upserts until a None sentinel arrives"""
+        inserted_count = 0
+        updated_count = 0
+        total = 0
+        batch = []
+        
+        while True:
+            job = await queue.get()
+            if job is not None:
+                batch.append(job)
+                total += 1
+            
+            # Flush on a full batch, at the end, or once the producers have gone quiet
+            if batch and (job is None or len(batch) >= SYNC_WRITE_BATCH_SIZE or queue.empty()):
+                inserted, updated = await self._upsert_jobs(batch)
+                inserted_count += inserted
+                updated_count += updated
+                batch = []
+            
+            if job is None:
+                break
+        
+        logger.info(f"Total jobs after filtering: {total}")
+        return inserted_count, updated_count
+    
+    async def _upsert_jobs(self, jobs: List[NormalizedJob]) -> Tuple[int, int]:
+        """Upsert one batch of jobs, returning (inserted, updated) counts"""
+        # The unique (source, external_id) index deduplicates on the server
+        ops = [
+            UpdateOne(
+                {"source": job.source, "external_id": job.external_id, "is_external": True},
+                {"$set": job.to_document()},
+                upsert=True
+            )
+            for job in jobs
+        ]
+        
+        try:
+            result = await self.db.jobs.bulk_write(ops, ordered=False)
+            return result.upserted_count, result.matched_count
+        except BulkWriteError as e:
+            # Unordered writes keep going past failures; count what did land
+            details = e.details
+            logger.warning(f"{len(details.get('writeErrors', []))} of {len(ops)} job writes failed")
+            return details.get("nUpserted", 0), details.get("nMatched", 0)
     
     async def sync_jobs(self):
         """Main sync function - fetches and stores jobs from all sources"""
@@ -701,6 +969,8 @@ class JobAggregator:
             logger.info("=" * 60)
             logger.info("Starting job sync...")
             
+            self.sync_timestamp = datetime.now(timezone.utc).isoformat()
+            
             # Get H1B companies
             h1b_companies = await self.get_h1b_companies()
             
@@ -708,99 +978,16 @@ class JobAggregator:
                 logger.warning("No H1B companies found in database. Skipping sync.")
                 return
             
-            all_normalized_jobs = []
-            
-            # Scrape from major company career websites
-            logger.info("Scraping from company career websites...")
-            
-            # Google
-            try:
-                google_jobs = await company_scraper.scrape_google_careers()
-                for job in google_jobs:
-                    normalized = company_scraper.normalize_google_job(job)
-                    if normalized:
-                        # Add wage level prediction
-                        normalized['wage_level'] = wage_predictor.predict_wage_level(
-                            normalized['job_title'],
-                            normalized['state'],
-                            normalized.get('base_salary', 0)
-                        )
-                        all_normalized_jobs.append(normalized)
-            except Exception as e:
-                logger.error(f"Error scraping Google: {e}")
-            
-            # Amazon
-            try:
-                amazon_jobs = await company_scraper.scrape_amazon_jobs()
-                for job in amazon_jobs:
-                    normalized = company_scraper.normalize_amazon_job(job)
-                    if normalized:
-                        normalized['wage_level'] = wage_predictor.predict_wage_level(
-                            normalized['job_title'],
-                            normalized['state'],
-                            normalized.get('base_salary', 0)
-                        )
-                        all_normalized_jobs.append(normalized)
-            except Exception as e:
-                logger.error(f"Error scraping Amazon: {e}")
-            
-            # Microsoft
-            try:
-                microsoft_jobs = await company_scraper.scrape_microsoft_careers()
-                for job in microsoft_jobs:
-                    normalized = company_scraper.normalize_microsoft_job(job)
-                    if normalized:
-                        normalized['wage_level'] = wage_predictor.predict_wage_level(
-                            normalized['job_title'],
-                            normalized['state'],
-                            normalized.get('base_salary', 0)
-                        )
-                        all_normalized_jobs.append(normalized)
-            except Exception as e:
-                logger.error(f"Error scraping Microsoft: {e}")
-            
-            # Fetch from Arbeitnow
-            arbeitnow_jobs = await self.fetch_arbeitnow_jobs()
-            for job in arbeitnow_jobs:
-                normalized = self.normalize_arbeitnow_job(job, h1b_companies)
-                if normalized:
-                    all_normalized_jobs.append(normalized)
-            
-            # Fetch from JSearch (RapidAPI - Google Jobs)
-            jsearch_api_key = os.environ.get("JSEARCH_API_KEY")
-            if jsearch_api_key:
-                jsearch_jobs = await self.fetch_jsearch_jobs(jsearch_api_key)
-                for job in jsearch_jobs:
-                    normalized = self.normalize_jsearch_job(job, h1b_companies)
-                    if normalized:
-                        all_normalized_jobs.append(normalized)
-            else:
+            if not self.jsearch_api_key:
                 logger.info("JSEARCH_API_KEY not found in environment, skipping JSearch")
             
-            # Fetch from Adzuna
-            adzuna_app_id = os.environ.get("ADZUNA_APP_ID")
-            adzuna_app_key = os.environ.get("ADZUNA_APP_KEY")
-            if adzuna_app_id and adzuna_app_key:
-                adzuna_jobs = await self.fetch_adzuna_jobs(adzuna_app_id, adzuna_app_key)
-                for job in adzuna_jobs:
-                    normalized = self.normalize_adzuna_job(job, h1b_companies)
-                    if normalized:
-                        all_normalized_jobs.append(normalized)
-            else:
+            if not (self.adzuna_app_id and self.adzuna_app_key):
                 logger.info("Adzuna API credentials not found, skipping Adzuna")
             
-            # Fetch from USAJOBS
-            usajobs_api_key = os.environ.get("USAJOBS_API_KEY")
-            if usajobs_api_key:
-                usajobs_jobs = await self.fetch_usajobs(usajobs_api_key)
-                for job_item in usajobs_jobs:
-                    normalized = self.normalize_usajobs_job(job_item, h1b_companies)
-                    if normalized:
-                        all_normalized_jobs.append(normalized)
-            else:
+            if not self.usajobs_api_key:
                 logger.info("USAJOBS_API_KEY not found in environment, skipping USAJOBS")
             
-            # Fetch from Greenhouse with public board tokens
+            # Public Greenhouse board tokens
             greenhouse_tokens = [
                 "gitlab", "stripe", "airbnb", "lyft", "dropbox", "coinbase",
                 "square", "robinhood", "doordash", "instacart", "reddit",
@@ -808,42 +995,32 @@ class JobAggregator:
                 "figma", "airtable", "asana", "cloudflare",
             ]
             
-            greenhouse_jobs = await self.fetch_greenhouse_jobs(greenhouse_tokens)
-            for job in greenhouse_jobs:
-                normalized = self.normalize_greenhouse_job(job, h1b_companies)
-                if normalized:
-                    all_normalized_jobs.append(normalized)
-            
-            # Deduplicate jobs by external_id + source
-            unique_jobs = {}
-            for job in all_normalized_jobs:
-                key = f"{job['source']}_{job['external_id']}"
-                unique_jobs[key] = job
-            
-            logger.info(f"Total unique jobs after filtering: {len(unique_jobs)}")
-            
-            # Upsert jobs to database
-            inserted_count = 0
-            updated_count = 0
-            
-            for job in unique_jobs.values():
-                existing = await self.db.jobs.find_one(
-                    {"job_id": job["job_id"]},
-                    {"_id": 0}
-                )
-                
-                if existing:
-                    # Update existing job
-                    await self.db.jobs.update_one(
-                        {"job_id": job["job_id"]},
-                        {"$set": job}
-                    )
-                    updated_count += 1
-                else:
-                    # Insert new job
-                    await self.db.jobs.insert_one(job)
-                    inserted_count += 1
-            
+            # Every provider is network-bound, so fetch them all concurrently
+            logger.info("Scraping from company career websites...")
+            fetchers = [
+                self._scrape_company_careers("Google", company_scraper.scrape_google_careers, company_scraper.normalize_google_job),
+                self._scrape_company_careers("Amazon", company_scraper.scrape_amazon_jobs, company_scraper.normalize_amazon_job),
+                self._scrape_company_careers("Microsoft", company_scraper.scrape_microsoft_careers, company_scraper.normalize_microsoft_job),
+                self._fetch_and_normalize_arbeitnow(h1b_companies),
+            ]
+            if self.jsearch_api_key:
+                fetchers.append(self._fetch_and_normalize_jsearch(self.jsearch_api_key, h1b_companies))
+            if self.adzuna_app_id and self.adzuna_app_key:
+                fetchers.append(self._fetch_and_normalize_adzuna(self.adzuna_app_id, self.adzuna_app_key, h1b_companies))
+            if self.usajobs_api_key:
+                fetchers.append(self._fetch_and_normalize_usajobs(self.usajobs_api_key, h1b_companies))
+            fetchers.append(self._fetch_and_normalize_greenhouse(greenhouse_tokens, h1b_companies))
+            
+            # Write jobs to the database while slower providers are still being fetched
+            queue = asyncio.Queue(maxsize=SYNC_QUEUE_SIZE)
+            async with asyncio.TaskGroup() as tg:
+                writer = tg.create_task(self._write_jobs(queue))
+                producers = [tg.create_task(self._enqueue_jobs(fetcher, queue)) for fetcher in fetchers]
+                await asyncio.gather(*producers)
+                # Signal the writer that no more jobs are coming
+                await queue.put(None)
+            
+            inserted_count, updated_count = writer.result()
             logger.info(f"Job sync complete: {inserted_count} inserted, {updated_count} updated")
             logger.info("=" * 60)
             
@@ -853,21 +1030,35 @@ class JobAggregator:
     async def get_sync_status(self) -> Dict:
         """Get status of last sync"""
         try:
-            # Count external jobs by source
-            arbeitnow_count = await self.db.jobs.count_documents({"source": "arbeitnow"})
-            greenhouse_count = await self.db.jobs.count_documents({"source": "greenhouse"})
-            usajobs_count = await self.db.jobs.count_documents({"source": "usajobs"})
-            jsearch_count = await self.db.jobs.count_documents({"source": "jsearch"})
-            adzuna_count = await self.db.jobs.count_documents({"source": "adzuna"})
-            internal_count = await self.db.jobs.count_documents({"is_external": {"$ne": True}})
-            
-            # Get last sync time
-            last_job = await self.db.jobs.find_one(
-                {"is_external": True},
-                {"_id": 0, "last_synced": 1},
-                sort=[("last_synced", -1)]
+            # Count jobs by source and internal jobs in a single pass
+            pipeline = [{"$facet": {
+                "by_source": [{"$group": {"_id": "$source", "n": {"$sum": 1}}}],
+                "internal": [{"$match": {"is_external": {"$ne": True}}}, {"$count": "n"}]
+            }}]
+            
+            async def count_jobs():
+                results = await self.db.jobs.aggregate(pipeline).to_list(1)
+                return results[0] if results else {}
+            
+            # Get last sync time alongside the counts
+            facets, last_job = await asyncio.gather(
+                count_jobs(),
+                self.db.jobs.find_one(
+                    {"is_external": True},
+                    {"_id": 0, "last_synced": 1},
+                    sort=[("last_synced", -1)]
+                )
             )
             
+            source_counts = {doc["_id"]: doc["n"] for doc in facets.get("by_source", [])}
+            arbeitnow_count = source_counts.get("arbeitnow", 0)
+            greenhouse_count = source_counts.get("greenhouse", 0)
+            usajobs_count = source_counts.get("usajobs", 0)
+            jsearch_count = source_counts.get("jsearch", 0)
+            adzuna_count = source_counts.get("adzuna", 0)
+            internal = facets.get("internal", [])
+            internal_count = internal[0]["n"] if internal else 0
+            
             last_synced = last_job.get("last_synced") if last_job else None
             
             total_external = arbeitnow_count + greenhouse_count + usajobs_count + jsearch_count + adzuna_count
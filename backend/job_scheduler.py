@@ -23,27 +23,24 @@ class JobScheduler:
             logger.warning("Scheduler is already running")
             return
         
-        # Schedule job sync to run every 60 seconds
+        # Schedule job sync to run every 60 seconds, starting immediately.
+        # A slow sync never overlaps the next one; missed runs collapse into one.
+        logger.info("Running initial job sync...")
         self.scheduler.add_job(
             func=self.aggregator.sync_jobs,
             trigger=IntervalTrigger(seconds=60),
             id='job_sync',
             name='Sync jobs from external APIs',
-            replace_existing=True
+            replace_existing=True,
+            next_run_time=datetime.now(timezone.utc),
+            coalesce=True,
+            max_instances=1,
+            misfire_grace_time=30
         )
         
         logger.info("Starting job scheduler - jobs will sync every 60 seconds")
         self.scheduler.start()
         self.is_running = True
-        
-        # Run initial sync immediately
-        logger.info("Running initial job sync...")
-        self.scheduler.add_job(
-            func=self.aggregator.sync_jobs,
-            id='initial_sync',
-            name='Initial job sync',
-            replace_existing=True
-        )
     
     def stop(self):
         """Stop the scheduler"""
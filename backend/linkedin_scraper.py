@@ -5,22 +5,55 @@ Scrapes jobs from LinkedIn using public search URLs
 import httpx
 import logging
 import re
-import json
+import orjson
 from typing import List, Dict, Optional
 from datetime import datetime, timezone
-from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
 import asyncio
+import random
 from urllib.parse import quote
 
 logger = logging.getLogger(__name__)
 
+# Patterns used while parsing search result pages, compiled once
+LD_JSON_RE = re.compile(rb'<script[^>]*type="application/ld\+json"[^>]*>(.*?)</script>', re.DOTALL)
+JOB_POSTING_JSON_RE = re.compile(r'\{[^}]*"jobPosting"[^}]*\}')
+STATE_RE = re.compile(r',\s*([A-Z]{2})\s*(?:,|\s|$)')
+
+# LinkedIn serves UTF-8; without an explicit encoding libxml2 guesses Latin-1 for raw bytes
+HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+
+# XPath queries for the search page DOM, compiled once by libxml2
+LD_JSON_SCRIPTS_XPATH = etree.XPath('//script[@type="application/ld+json"]/text()')
+SCRIPTS_XPATH = etree.XPath('//script/text()')
+BASE_CARDS_XPATH = etree.XPath('//div[contains(@class, "base-card")]')
+CARD_TITLE_XPATH = etree.XPath('string(.//h3[contains(@class, "base-search-card__title")])')
+CARD_COMPANY_XPATH = etree.XPath('string(.//h4[contains(@class, "base-search-card__subtitle")])')
+CARD_LOCATION_XPATH = etree.XPath('string(.//span[contains(@class, "job-search-card__location")])')
+CARD_LINK_XPATH = etree.XPath('.//a[contains(@class, "base-card__full-link")]/@href')
+
+# Number of keyword searches run against LinkedIn at the same time
+SEARCH_CONCURRENCY = 3
+# Number of result pages fetched at the same time within one search
+PAGE_CONCURRENCY = 4
+# Attempts per search when LinkedIn rate limits before returning any jobs
+SEARCH_MAX_ATTEMPTS = 3
+SEARCH_BACKOFF_BASE = 5.0
+
+class LinkedInRateLimitError(Exception):
+    """Raised when LinkedIn rate limits a search before it returned any jobs"""
+
 class LinkedInScraper:
     """Scrapes jobs from LinkedIn"""
     
     def __init__(self):
+        # HTTP/2 lets concurrent page fetches share one multiplexed connection
         self.http_client = httpx.AsyncClient(
+            http2=True,
             timeout=30.0,
             follow_redirects=True,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
             headers={
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
                 'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
@@ -48,112 +81,114 @@ class LinkedInScraper:
         try:
             logger.info(f"Scraping LinkedIn jobs for: {keywords} in {location}")
             
-            all_jobs = []
+            # LinkedIn public job search URL
+            search_url = f"{self.base_url}/jobs/search/"
             
-            for page in range(max_pages):
-                start = page * 25
-                
-                # LinkedIn public job search URL
-                search_url = f"{self.base_url}/jobs/search/"
-                params = {
-                    'keywords': keywords,
-                    'location': location,
-                    'start': start,
-                    'f_TP': '1',  # Past 24 hours
-                    'position': 1,
-                    'pageNum': page
-                }
-                
-                try:
-                    logger.info(f"Fetching LinkedIn page {page + 1}/{max_pages} (start={start})")
+            # Pages are fetched concurrently; once a page ends the search,
+            # pages that haven't started yet are skipped
+            semaphore = asyncio.Semaphore(PAGE_CONCURRENCY)
+            stop_event = asyncio.Event()
+            rate_limited = False
+            
+            async def fetch_page(page: int) -> Optional[List[Dict]]:
+                """Fetch one results page; None means the search ends at this page"""
+                nonlocal rate_limited
+                async with semaphore:
+                    if stop_event.is_set():
+                        return None
                     
-                    response = await self.http_client.get(search_url, params=params)
+                    start = page * 25
+                    params = {
+                        'keywords': keywords,
+                        'location': location,
+                        'start': start,
+                        'f_TP': '1',  # Past 24 hours
+                        'position': 1,
+                        'pageNum': page
+                    }
                     
-                    if response.status_code == 200:
-                        html = response.text
-                        
-                        # Parse jobs from HTML
-                        jobs = self.parse_jobs_from_html(html)
-                        
-                        if not jobs:
-                            logger.warning(f"No jobs found on page {page + 1}")
-                            break
-                        
-                        all_jobs.extend(jobs)
-                        logger.info(f"Extracted {len(jobs)} jobs from page {page + 1}")
-                        
-                        # Rate limiting
-                        await asyncio.sleep(2)
+                    try:
+                        logger.info(f"Fetching LinkedIn page {page + 1}/{max_pages} (start={start})")
                         
-                    elif response.status_code == 429:
-                        logger.error("LinkedIn rate limit hit - stopping")
-                        break
-                    else:
-                        logger.error(f"LinkedIn returned status {response.status_code}")
-                        break
+                        response = await self.http_client.get(search_url, params=params)
                         
-                except Exception as e:
-                    logger.error(f"Error fetching LinkedIn page {page}: {e}")
-                    continue
+                        if response.status_code == 200:
+                            # Parse jobs from the raw bytes; no need to decode the whole page to str
+                            jobs = self.parse_jobs_from_html(response.content)
+                            
+                            if not jobs:
+                                logger.warning(f"No jobs found on page {page + 1}")
+                                stop_event.set()
+                                return None
+                            
+                            logger.info(f"Extracted {len(jobs)} jobs from page {page + 1}")
+                            return jobs
+                        elif response.status_code == 429:
+                            logger.error("LinkedIn rate limit hit - stopping")
+                            rate_limited = True
+                        else:
+                            logger.error(f"LinkedIn returned status {response.status_code}")
+                        stop_event.set()
+                        return None
+                    except Exception as e:
+                        logger.error(f"Error fetching LinkedIn page {page}: {e}")
+                        return []
+            
+            pages = await asyncio.gather(*[fetch_page(page) for page in range(max_pages)])
+            
+            # Keep results in page order, up to the first page that ended the search
+            all_jobs = []
+            for jobs in pages:
+                if jobs is None:
+                    break
+                all_jobs.extend(jobs)
+            
+            if rate_limited and not all_jobs:
+                raise LinkedInRateLimitError(f"Rate limited searching for {keywords}")
             
             logger.info(f"Total LinkedIn jobs scraped: {len(all_jobs)}")
             return all_jobs
             
+        except LinkedInRateLimitError:
+            raise
         except Exception as e:
             logger.error(f"Error scraping LinkedIn: {e}")
             return []
     
-    def parse_jobs_from_html(self, html: str) -> List[Dict]:
+    def parse_jobs_from_html(self, html: bytes) -> List[Dict]:
         """Parse job listings from LinkedIn HTML"""
-        jobs = []
+        # Fast path: pull JSON-LD payloads out with a regex, without building a DOM
+        jobs = self.parse_ld_json_jobs(html)
+        if jobs or not html.strip():
+            return jobs
         
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            tree = lxml.html.fromstring(html, parser=HTML_PARSER)
             
             # Method 1: Try to find JSON data embedded in HTML
-            script_tags = soup.find_all('script', type='application/ld+json')
-            for script in script_tags:
+            for script in LD_JSON_SCRIPTS_XPATH(tree):
                 try:
-                    data = json.loads(script.string)
-                    if isinstance(data, dict) and data.get('@type') == 'JobPosting':
-                        job = self.parse_json_job(data)
-                        if job:
-                            jobs.append(job)
-                    elif isinstance(data, list):
-                        for item in data:
-                            if isinstance(item, dict) and item.get('@type') == 'JobPosting':
-                                job = self.parse_json_job(item)
-                                if job:
-                                    jobs.append(job)
+                    self.collect_json_jobs(orjson.loads(script), jobs)
                 except:
                     continue
             
             # Method 2: Parse job cards from HTML
             if not jobs:
-                job_cards = soup.find_all('div', class_=re.compile(r'base-card'))
-                
-                for card in job_cards:
+                for card in BASE_CARDS_XPATH(tree):
                     try:
                         # Extract job ID from card
                         job_id = None
                         if card.get('data-entity-urn'):
-                            job_id = card['data-entity-urn'].split(':')[-1]
-                        
-                        # Extract title
-                        title_elem = card.find('h3', class_=re.compile(r'base-search-card__title'))
-                        title = title_elem.text.strip() if title_elem else None
+                            job_id = card.get('data-entity-urn').split(':')[-1]
                         
-                        # Extract company
-                        company_elem = card.find('h4', class_=re.compile(r'base-search-card__subtitle'))
-                        company = company_elem.text.strip() if company_elem else None
-                        
-                        # Extract location
-                        location_elem = card.find('span', class_=re.compile(r'job-search-card__location'))
-                        location = location_elem.text.strip() if location_elem else None
+                        # Extract title, company and location text
+                        title = CARD_TITLE_XPATH(card).strip()
+                        company = CARD_COMPANY_XPATH(card).strip()
+                        location = CARD_LOCATION_XPATH(card).strip()
                         
                         # Extract link
-                        link_elem = card.find('a', class_=re.compile(r'base-card__full-link'))
-                        job_url = link_elem['href'] if link_elem and link_elem.get('href') else None
+                        links = CARD_LINK_XPATH(card)
+                        job_url = links[0] if links and links[0] else None
                         
                         if title and company and job_id:
                             jobs.append({
@@ -171,13 +206,13 @@ class LinkedInScraper:
             # Method 3: Try API-like data
             if not jobs:
                 # LinkedIn sometimes includes data in script tags
-                for script in soup.find_all('script'):
-                    if script.string and 'jobPosting' in script.string.lower():
+                for script in SCRIPTS_XPATH(tree):
+                    if 'jobPosting' in script.lower():
                         try:
                             # Try to extract JSON from script
-                            match = re.search(r'\{[^}]*"jobPosting"[^}]*\}', script.string)
+                            match = JOB_POSTING_JSON_RE.search(script)
                             if match:
-                                data = json.loads(match.group(0))
+                                data = orjson.loads(match.group(0))
                                 # Process data...
                         except:
                             continue
@@ -187,6 +222,29 @@ class LinkedInScraper:
         
         return jobs
     
+    def parse_ld_json_jobs(self, html: bytes) -> List[Dict]:
+        """Extract JobPosting entries from JSON-LD script tags using a regex scan"""
+        jobs = []
+        for match in LD_JSON_RE.finditer(html):
+            try:
+                self.collect_json_jobs(orjson.loads(match.group(1)), jobs)
+            except:
+                continue
+        return jobs
+    
+    def collect_json_jobs(self, data, jobs: List[Dict]):
+        """Append parsed JobPosting objects from a JSON-LD dict or list to jobs"""
+        if isinstance(data, dict) and data.get('@type') == 'JobPosting':
+            job = self.parse_json_job(data)
+            if job:
+                jobs.append(job)
+        elif isinstance(data, list):
+            for item in data:
+                if isinstance(item, dict) and item.get('@type') == 'JobPosting':
+                    job = self.parse_json_job(item)
+                    if job:
+                        jobs.append(job)
+    
     def parse_json_job(self, data: Dict) -> Optional[Dict]:
         """Parse job from JSON-LD format"""
         try:
@@ -217,21 +275,35 @@ class LinkedInScraper:
             {"keywords": "devops engineer", "location": "United States"},
         ]
         
-        for search in searches:
-            try:
-                jobs = await self.scrape_linkedin_jobs(
-                    keywords=search['keywords'],
-                    location=search['location'],
-                    max_pages=3  # 3 pages = 75 jobs per search
-                )
-                all_jobs.extend(jobs)
-                
-                # Rate limiting between searches
-                await asyncio.sleep(5)
-                
-            except Exception as e:
-                logger.error(f"Error in search {search}: {e}")
+        # Run searches concurrently, bounded so LinkedIn doesn't rate limit us
+        semaphore = asyncio.Semaphore(SEARCH_CONCURRENCY)
+        
+        async def run_search(search: Dict) -> List[Dict]:
+            async with semaphore:
+                for attempt in range(SEARCH_MAX_ATTEMPTS):
+                    # Jittered start so concurrent searches don't hit LinkedIn in lockstep
+                    await asyncio.sleep(random.uniform(0, 2))
+                    try:
+                        return await self.scrape_linkedin_jobs(
+                            keywords=search['keywords'],
+                            location=search['location'],
+                            max_pages=3  # 3 pages = 75 jobs per search
+                        )
+                    except LinkedInRateLimitError as e:
+                        if attempt == SEARCH_MAX_ATTEMPTS - 1:
+                            break
+                        delay = SEARCH_BACKOFF_BASE * 2 ** attempt
+                        logger.warning(f"{e} - retrying in {delay:.0f}s")
+                        await asyncio.sleep(delay)
+                logger.error(f"Giving up on search {search} after {SEARCH_MAX_ATTEMPTS} rate limited attempts")
+                return []
+        
+        results = await asyncio.gather(*[run_search(search) for search in searches], return_exceptions=True)
+        for search, result in zip(searches, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error in search {search}: {result}")
                 continue
+            all_jobs.extend(result)
         
         # Deduplicate
         unique_jobs = {}
@@ -244,9 +316,10 @@ class LinkedInScraper:
     def normalize_linkedin_job(self, job: Dict) -> Optional[Dict]:
         """Normalize LinkedIn job to our schema"""
         try:
+            now_iso = datetime.now(timezone.utc).isoformat()
             # Extract state from location
             location = job.get('location', 'United States')
-            state_match = re.search(r',\s*([A-Z]{2})\s*(?:,|\s|$)', location)
+            state_match = STATE_RE.search(location)
             state = state_match.group(1) if state_match else 'CA'
             
             # Estimate salary based on title
@@ -270,10 +343,10 @@ class LinkedInScraper:
                 "state": state,
                 "base_salary": base_salary,
                 "job_description": job.get('description', '')[:5000],
-                "posted_date": datetime.now(timezone.utc).isoformat(),
+                "posted_date": now_iso,
                 "employment_type": "Full-time",
                 "is_external": True,
-                "last_synced": datetime.now(timezone.utc).isoformat()
+                "last_synced": now_iso
             }
         except Exception as e:
             logger.error(f"Error normalizing LinkedIn job: {e}")
@@ -0,0 +1,56 @@
+"""
+Async Rate Limiter
+Token bucket used to space out requests to rate-limited APIs
+"""
+import asyncio
+import time
+from typing import Dict
+from urllib.parse import urlsplit
+
+class AsyncRateLimiter:
+    """Token bucket allowing `rate` acquisitions per `period` seconds"""
+
+    def __init__(self, rate: float, period: float = 1.0):
+        self.rate = rate
+        self.period = period
+        self.tokens = rate
+        self.updated_at = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                # Refill proportionally to the time elapsed, capped at one full bucket
+                self.tokens = min(self.rate, self.tokens + (now - self.updated_at) * self.rate / self.period)
+                self.updated_at = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self.tokens) * self.period / self.rate)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+class HostRateLimiters:
+    """Token buckets keyed by host, so only requests to the same site wait on each other"""
+
+    def __init__(self, rate: float, period: float = 1.0):
+        self.rate = rate
+        self.period = period
+        self.limiters: Dict[str, AsyncRateLimiter] = {}
+
+    def for_url(self, url: str) -> AsyncRateLimiter:
+        """Get the rate limiter for a URL's host, creating it on first use"""
+        host = urlsplit(url).netloc
+        limiter = self.limiters.get(host)
+        if limiter is None:
+            limiter = self.limiters[host] = AsyncRateLimiter(self.rate, self.period)
+        return limiter
@@ -6,6 +6,9 @@ Scrapes jobs from all H1B-sponsoring companies in database
 import asyncio
 import sys
 import re
+import socket
+import time
+from collections import Counter
 sys.path.append('/app/backend')
 
 from motor.motor_asyncio import AsyncIOMotorClient
@@ -13,13 +16,15 @@ from dotenv import load_dotenv
 import os
 import httpx
 from bs4 import BeautifulSoup
-import json
-from urllib.parse import urljoin, urlparse
-from typing import List, Dict, Optional
+import orjson
+from typing import List, Dict, Optional, Tuple
+from rate_limiter import HostRateLimiters
+from dns_cache import cached_dns_transport
+from url_utils import url_origin, fast_urljoin, fetch_capped_text
 
 load_dotenv('/app/backend/.env')
 
-# Company career page patterns
+# Company career page patterns, most likely first
 CAREER_URL_PATTERNS = [
     'careers',
     'jobs',
@@ -30,6 +35,69 @@ CAREER_URL_PATTERNS = [
     'hiring'
 ]
 
+# Career page routes remembered between runs, so later runs skip URL probing
+ROUTE_CACHE_FILE = '/app/backend/.scraper_route_cache.json'
+ROUTE_CACHE_TTL = 7 * 86400
+# Companies whose every career URL is definitively gone are not probed again for this long
+DEAD_ROUTE_CACHE_TTL = 2 * 86400
+# Responses meaning a career URL doesn't exist, as opposed to a timeout or rate limit
+DEAD_STATUS_CODES = frozenset({404, 410})
+# Resolver errors meaning the guessed domain doesn't exist
+NXDOMAIN_ERRORS = frozenset(code for code in (socket.EAI_NONAME, getattr(socket, 'EAI_NODATA', None)) if code is not None)
+
+# Career URLs tried per company, and how many of the top ones are HEAD-probed together
+MAX_CAREER_URLS = 5
+CAREER_URL_PROBES = 3
+
+# Job elements examined per career page; the search stops once this many are found
+MAX_JOB_ELEMENTS = 50
+
+# Career pages are cut off at this size; job listings never need multi-MB bodies
+MAX_PAGE_BYTES = 512 * 1024
+
+# Bytes of a page scanned for ATS widgets; they are injected as script tags in <head>
+ATS_SNIFF_BYTES = 4096
+
+# Number of companies scraped at the same time
+SCRAPE_CONCURRENCY = 20
+# Companies buffered between the database cursor and the scraping workers
+COMPANY_QUEUE_SIZE = 200
+# Limit to first 100 companies for demo
+MAX_COMPANIES = 100
+# Requests per second allowed against any single host
+HOST_RATE_LIMIT = 2
+
+# Patterns used while scraping career pages, compiled once
+JOB_HREF_RE = re.compile(r'job|position|opening', re.I)
+JOB_CLASS_RE = re.compile(r'job|position|role|opening', re.I)
+TITLE_CLASS_RE = re.compile(r'title|name|heading', re.I)
+LOCATION_CLASS_RE = re.compile(r'location|city', re.I)
+BOARD_TOKEN_RE = re.compile(r'boards?[/-]?([a-zA-Z0-9_-]+)')
+JSON_LD_RE = re.compile(r'<script[^>]+application/ld\+json[^>]*>(.*?)</script>', re.I | re.S)
+LEVER_RE = re.compile(r'lever\.co/([a-zA-Z0-9_-]+)')
+# One alternation scans a lowercased title for every keyword in a single pass
+JOB_TITLE_KEYWORDS_RE = re.compile('engineer|developer|scientist|analyst|manager|architect|designer')
+
+# Companies whose ATS board is already known, keyed by normalized company name;
+# these go straight to the ATS API without guessing or fetching career pages
+KNOWN_ATS_BOARDS = {
+    'stripe': ('greenhouse', 'stripe'),
+    'airbnb': ('greenhouse', 'airbnb'),
+    'dropbox': ('greenhouse', 'dropbox'),
+    'pinterest': ('greenhouse', 'pinterest'),
+    'lyft': ('greenhouse', 'lyft'),
+    'coinbase': ('greenhouse', 'coinbase'),
+    'coinbase global': ('greenhouse', 'coinbase'),
+    'databricks': ('greenhouse', 'databricks'),
+    'robinhood': ('greenhouse', 'robinhood'),
+    'figma': ('greenhouse', 'figma'),
+    'doordash': ('greenhouse', 'doordash'),
+    'reddit': ('greenhouse', 'reddit'),
+    'palantir technologies': ('lever', 'palantir'),
+    'netflix': ('lever', 'netflix'),
+}
+COMPANY_SUFFIX_RE = re.compile(r'[^a-z0-9 ]|\b(inc|llc|corp|corporation|co|ltd|lp)\b')
+
 # Common ATS platforms
 ATS_PATTERNS = {
     'greenhouse': 'greenhouse.io',
@@ -43,13 +111,28 @@ ATS_PATTERNS = {
     'breezy': 'breezy.hr'
 }
 
+def is_nxdomain(error: BaseException) -> bool:
+    """Check whether a request failed because its host name doesn't resolve"""
+    while error is not None:
+        if isinstance(error, socket.gaierror) and error.errno in NXDOMAIN_ERRORS:
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
 class CompanyCareerScraper:
     """Scrapes jobs from company career pages"""
     
     def __init__(self):
+        # One pooled HTTP/2 client for the whole run, so repeat visits to the
+        # same ATS host reuse connections instead of new TLS handshakes
         self.http_client = httpx.AsyncClient(
             timeout=15.0,
             follow_redirects=True,
+            # Each host is looked up once per run, however many connections it gets
+            transport=cached_dns_transport(
+                http2=True,
+                limits=httpx.Limits(max_connections=200, max_keepalive_connections=100, keepalive_expiry=30)
+            ),
             headers={
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
@@ -57,20 +140,51 @@ class CompanyCareerScraper:
         self.scraped_jobs = []
         self.successful_companies = []
         self.failed_companies = []
+        self.host_limiters = HostRateLimiters(HOST_RATE_LIMIT)
+        self.route_cache = self.load_route_cache()
     
     async def close(self):
         await self.http_client.aclose()
+        self.save_route_cache()
+    
+    def load_route_cache(self) -> Dict:
+        """Load remembered career page routes, dropping expired ones"""
+        try:
+            with open(ROUTE_CACHE_FILE, 'rb') as f:
+                cache = orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError):
+            return {}
+        now = time.time()
+        return {key: route for key, route in cache.items() if route.get('expires_at', 0) > now}
+    
+    def save_route_cache(self):
+        """Persist career page routes for the next run"""
+        try:
+            with open(ROUTE_CACHE_FILE, 'wb') as f:
+                f.write(orjson.dumps(self.route_cache))
+        except OSError:
+            pass
+    
+    async def fetch(self, url: str) -> httpx.Response:
+        """GET a URL, politely rate limited per host"""
+        async with self.host_limiters.for_url(url):
+            return await self.http_client.get(url)
+    
+    async def fetch_page(self, url: str) -> Optional[str]:
+        """GET an HTML page, reading at most MAX_PAGE_BYTES of it"""
+        async with self.host_limiters.for_url(url):
+            return await fetch_capped_text(self.http_client, url, MAX_PAGE_BYTES)
     
     def guess_career_url(self, company_name: str, website: str = None) -> List[str]:
-        """Generate possible career page URLs for a company"""
+        """Generate possible career page URLs for a company, most likely first"""
         urls = []
         
         if website:
             base_url = website.rstrip('/')
-            # Try common career page paths
+            # Paths on the known website are far more likely than guessed domains.
+            # Trailing-slash variants are left out, redirects already cover them.
             for pattern in CAREER_URL_PATTERNS:
                 urls.append(f"{base_url}/{pattern}")
-                urls.append(f"{base_url}/{pattern}/")
         
         # Common domain patterns
         clean_name = company_name.lower().replace(' ', '').replace(',', '').replace('.', '')
@@ -81,29 +195,64 @@ class CompanyCareerScraper:
         
         return urls
     
-    async def detect_ats_platform(self, url: str) -> Optional[str]:
-        """Detect which ATS platform a company uses"""
-        try:
-            response = await self.http_client.get(url)
-            if response.status_code == 200:
-                html = response.text.lower()
-                final_url = str(response.url).lower()
-                
-                for ats_name, ats_domain in ATS_PATTERNS.items():
-                    if ats_domain in final_url or ats_domain in html:
-                        return ats_name
-        except:
-            pass
+    def detect_ats_from_url(self, url: str) -> Optional[str]:
+        """Detect an ATS platform from the URL alone, without fetching it"""
+        url = url.lower()
+        for ats_name, ats_domain in ATS_PATTERNS.items():
+            if ats_domain in url:
+                return ats_name
         return None
     
+    async def probe_url(self, url: str) -> Tuple[Optional[str], bool]:
+        """HEAD a candidate URL, returning where it ends up if it exists, and
+        whether a failure is definitive (404/410 or unknown domain)"""
+        try:
+            async with self.host_limiters.for_url(url):
+                response = await self.http_client.head(url)
+            # Some servers refuse HEAD but serve the page fine
+            if response.status_code < 400 or response.status_code == 405:
+                return str(response.url), False
+            return None, response.status_code in DEAD_STATUS_CODES
+        except Exception as e:
+            return None, is_nxdomain(e)
+    
+    async def detect_ats_platform(self, url: str) -> Tuple[Optional[str], bool]:
+        """Detect which ATS platform a company uses, and whether the URL is
+        definitively gone (404/410 or unknown domain)"""
+        ats = self.detect_ats_from_url(url)
+        if ats:
+            return ats, False
+        
+        try:
+            # Stream the page so only its first few KB are downloaded
+            async with self.host_limiters.for_url(url):
+                async with self.http_client.stream('GET', url) as response:
+                    if response.status_code != 200:
+                        return None, response.status_code in DEAD_STATUS_CODES
+                    
+                    # Redirects to the ATS host are the cheapest giveaway
+                    ats = self.detect_ats_from_url(str(response.url))
+                    if ats:
+                        return ats, False
+                    
+                    prefix = b''
+                    async for chunk in response.aiter_bytes():
+                        prefix += chunk
+                        if len(prefix) >= ATS_SNIFF_BYTES:
+                            break
+            
+            return self.detect_ats_from_url(prefix[:ATS_SNIFF_BYTES].decode('utf-8', 'ignore')), False
+        except Exception as e:
+            return None, is_nxdomain(e)
+    
     async def scrape_greenhouse_company(self, company_name: str, board_token: str) -> List[Dict]:
         """Scrape jobs from Greenhouse"""
         try:
             url = f"https://boards-api.greenhouse.io/v1/boards/{board_token}/jobs?content=true"
-            response = await self.http_client.get(url)
+            response = await self.fetch(url)
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 jobs = data.get('jobs', [])
                 
                 normalized = []
@@ -126,10 +275,10 @@ class CompanyCareerScraper:
         """Scrape jobs from Lever"""
         try:
             url = f"https://api.lever.co/v0/postings/{lever_name}?mode=json"
-            response = await self.http_client.get(url)
+            response = await self.fetch(url)
             
             if response.status_code == 200:
-                jobs = response.json()
+                jobs = orjson.loads(response.content)
                 
                 normalized = []
                 for job in jobs:
@@ -150,27 +299,17 @@ class CompanyCareerScraper:
     async def scrape_generic_career_page(self, company_name: str, url: str) -> List[Dict]:
         """Generic scraper for career pages"""
         try:
-            response = await self.http_client.get(url)
-            if response.status_code != 200:
+            html = await self.fetch_page(url)
+            if html is None:
                 return []
             
-            soup = BeautifulSoup(response.text, 'html.parser')
             jobs = []
             
-            # Look for job listings with common patterns
-            job_elements = []
-            
-            # Pattern 1: Links with "job" or "position" in href/class
-            job_elements.extend(soup.find_all('a', href=re.compile(r'job|position|opening', re.I)))
-            
-            # Pattern 2: Divs with job-related classes
-            job_elements.extend(soup.find_all(['div', 'li', 'article'], class_=re.compile(r'job|position|role|opening', re.I)))
-            
-            # Pattern 3: JSON-LD structured data
-            script_tags = soup.find_all('script', type='application/ld+json')
-            for script in script_tags:
+            # JSON-LD structured data comes straight out of the raw HTML; sites that
+            # publish it are fully covered without building a DOM
+            for match in JSON_LD_RE.finditer(html):
                 try:
-                    data = json.loads(script.string)
+                    data = orjson.loads(match.group(1))
                     if isinstance(data, dict) and data.get('@type') == 'JobPosting':
                         jobs.append({
                             'company': company_name,
@@ -183,14 +322,32 @@ class CompanyCareerScraper:
                 except:
                     continue
             
+            if jobs:
+                return jobs[:20]
+            
+            soup = BeautifulSoup(html, 'lxml')
+            
+            # Look for job listings with common patterns
+            job_elements = []
+            
+            # Pattern 1: Links with "job" or "position" in href/class
+            job_elements.extend(soup.find_all('a', href=JOB_HREF_RE, limit=MAX_JOB_ELEMENTS))
+            
+            # Pattern 2: Divs with job-related classes, only if the links did not fill the quota
+            if len(job_elements) < MAX_JOB_ELEMENTS:
+                job_elements.extend(soup.find_all(['div', 'li', 'article'], class_=JOB_CLASS_RE,
+                                                  limit=MAX_JOB_ELEMENTS - len(job_elements)))
+            
             # Extract from HTML elements
-            for elem in job_elements[:50]:  # Limit to 50 per page
+            origin = url_origin(url)
+            for elem in job_elements:
                 try:
-                    title_elem = elem.find(['h2', 'h3', 'h4', 'span', 'strong'], class_=re.compile(r'title|name|heading', re.I))
+                    title_elem = elem.find(['h2', 'h3', 'h4', 'span', 'strong'], class_=TITLE_CLASS_RE)
                     if not title_elem:
                         title_elem = elem
                     
                     title = title_elem.get_text(strip=True)
+                    title_lc = title.lower()
                     
                     # Skip if not a real job title
                     if len(title) < 5 or len(title) > 100:
@@ -199,13 +356,13 @@ class CompanyCareerScraper:
                     # Get URL
                     job_url = elem.get('href') if elem.name == 'a' else None
                     if job_url:
-                        job_url = urljoin(url, job_url)
+                        job_url = fast_urljoin(url, origin, job_url)
                     
                     # Get location
-                    location_elem = elem.find(['span', 'div', 'p'], class_=re.compile(r'location|city', re.I))
+                    location_elem = elem.find(['span', 'div', 'p'], class_=LOCATION_CLASS_RE)
                     location = location_elem.get_text(strip=True) if location_elem else 'Remote'
                     
-                    if title and any(keyword in title.lower() for keyword in ['engineer', 'developer', 'scientist', 'analyst', 'manager', 'architect', 'designer']):
+                    if title and JOB_TITLE_KEYWORDS_RE.search(title_lc):
                         jobs.append({
                             'company': company_name,
                             'title': title,
@@ -222,46 +379,108 @@ class CompanyCareerScraper:
         except Exception as e:
             return []
     
+    async def scrape_route(self, company_name: str, route: Dict) -> List[Dict]:
+        """Scrape a company through a previously successful route"""
+        if route['ats'] == 'greenhouse':
+            return await self.scrape_greenhouse_company(company_name, route['token'])
+        if route['ats'] == 'lever':
+            return await self.scrape_lever_company(company_name, route['token'])
+        return await self.scrape_generic_career_page(company_name, route['url'])
+    
+    async def try_career_url(self, company_name: str, url: str, head_probe: bool = False) -> Tuple[List[Dict], Optional[Dict], bool]:
+        """Scrape one candidate career URL, returning its jobs, the route that found them,
+        and whether the URL failed definitively (404/410 or unknown domain)"""
+        try:
+            # Detect ATS; the top candidates are HEAD-probed first so dead URLs cost one request
+            if head_probe:
+                url, dead = await self.probe_url(url)
+                if not url:
+                    return [], None, dead
+                ats = self.detect_ats_from_url(url)
+            else:
+                ats, dead = await self.detect_ats_platform(url)
+                if dead:
+                    return [], None, True
+            
+            if ats == 'greenhouse':
+                # Extract board token from URL
+                match = BOARD_TOKEN_RE.search(url)
+                if match:
+                    board_token = match.group(1)
+                    jobs = await self.scrape_greenhouse_company(company_name, board_token)
+                    if jobs:
+                        return jobs, {'url': url, 'ats': 'greenhouse', 'token': board_token}, False
+            
+            elif ats == 'lever':
+                # Extract lever name
+                match = LEVER_RE.search(url)
+                if match:
+                    lever_name = match.group(1)
+                    jobs = await self.scrape_lever_company(company_name, lever_name)
+                    if jobs:
+                        return jobs, {'url': url, 'ats': 'lever', 'token': lever_name}, False
+            
+            # Try generic scraping
+            jobs = await self.scrape_generic_career_page(company_name, url)
+            if jobs:
+                return jobs, {'url': url, 'ats': 'generic', 'token': None}, False
+        except Exception as e:
+            return [], None, is_nxdomain(e)
+        return [], None, False
+    
     async def scrape_company(self, company_name: str, website: str = None) -> List[Dict]:
         """Scrape jobs from a single company"""
         jobs = []
+        route = None
         
-        # Generate possible career URLs
-        career_urls = self.guess_career_url(company_name, website)
+        # Known ATS boards need no URL guessing at all
+        known = KNOWN_ATS_BOARDS.get(' '.join(COMPANY_SUFFIX_RE.sub(' ', company_name.lower()).split()))
+        if known:
+            ats, token = known
+            jobs = await self.scrape_route(company_name, {'ats': ats, 'token': token, 'url': None})
+            if jobs:
+                return jobs
         
-        for url in career_urls[:5]:  # Try first 5 URLs
-            try:
-                # Detect ATS
-                ats = await self.detect_ats_platform(url)
-                
-                if ats == 'greenhouse':
-                    # Extract board token from URL
-                    match = re.search(r'boards?[/-]?([a-zA-Z0-9_-]+)', url)
-                    if match:
-                        board_token = match.group(1)
-                        jobs = await self.scrape_greenhouse_company(company_name, board_token)
-                        if jobs:
-                            break
-                
-                elif ats == 'lever':
-                    # Extract lever name
-                    match = re.search(r'lever\.co/([a-zA-Z0-9_-]+)', url)
-                    if match:
-                        lever_name = match.group(1)
-                        jobs = await self.scrape_lever_company(company_name, lever_name)
-                        if jobs:
-                            break
-                
-                # Try generic scraping
-                if not jobs:
-                    jobs = await self.scrape_generic_career_page(company_name, url)
-                    if jobs:
-                        break
-                
-                await asyncio.sleep(0.5)  # Rate limiting
-                
-            except Exception as e:
-                continue
+        # Reuse the route that worked last time, or skip companies known to have none
+        cache_key = f"{company_name}|{website or ''}"
+        cached = self.route_cache.get(cache_key)
+        if cached and cached['expires_at'] > time.time():
+            if not cached.get('url'):
+                return []
+            jobs = await self.scrape_route(company_name, cached)
+            if jobs:
+                return jobs
+        
+        # Generate possible career URLs and try them all at once; the first one
+        # that yields jobs wins and the slower probes are cancelled
+        career_urls = self.guess_career_url(company_name, website)[:MAX_CAREER_URLS]
+        pending = {
+            asyncio.create_task(self.try_career_url(company_name, url, head_probe=i < CAREER_URL_PROBES))
+            for i, url in enumerate(career_urls)
+        }
+        
+        # A timeout, connection error or 429 on any candidate keeps the company off the dead list
+        all_dead = bool(career_urls)
+        while pending and not route:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                found_jobs, found_route, dead = task.result()
+                all_dead = all_dead and dead
+                if found_jobs:
+                    jobs, route = found_jobs, found_route
+                    break
+        
+        for task in pending:
+            task.cancel()
+        # Let the cancelled probes unwind before returning, so none is still using the
+        # client or a host limiter when the scraper closes
+        await asyncio.gather(*pending, return_exceptions=True)
+        
+        if route:
+            route['expires_at'] = time.time() + ROUTE_CACHE_TTL
+            self.route_cache[cache_key] = route
+        elif all_dead:
+            self.route_cache[cache_key] = {'url': None, 'expires_at': time.time() + DEAD_ROUTE_CACHE_TTL}
         
         return jobs
 
@@ -276,10 +495,10 @@ async def main():
     client = AsyncIOMotorClient(mongo_url)
     db = client[os.environ['DB_NAME']]
     
-    # Get all H1B companies
+    # Stream H1B companies from the cursor instead of loading them all at once
     print("📊 Fetching H1B-sponsoring companies from database...")
-    companies = await db.companies.find({}, {"_id": 0, "name": 1, "website": 1}).to_list(None)
-    print(f"✅ Found {len(companies)} H1B-sponsoring companies")
+    total = min(await db.companies.estimated_document_count(), MAX_COMPANIES)
+    print(f"✅ Found {total} H1B-sponsoring companies")
     print()
     
     # Create scraper
@@ -290,33 +509,60 @@ async def main():
     print()
     
     all_jobs = []
+    # The same posting can be reached through several career URLs; keep it once
+    seen_jobs = set()
+    company_counts = Counter()
     successful = 0
     failed = 0
+    scraped = 0
     
-    # Scrape each company
-    for i, company in enumerate(companies[:100], 1):  # Limit to first 100 for demo
-        company_name = company.get('name', '')
-        website = company.get('website')
-        
-        try:
-            print(f"[{i}/{min(100, len(companies))}] Scraping: {company_name[:50]}...", end=' ', flush=True)
+    # Bounded queue keeps memory proportional to the number of workers, not companies
+    queue = asyncio.Queue(maxsize=COMPANY_QUEUE_SIZE)
+    
+    async def produce():
+        cursor = db.companies.find({}, {"_id": 0, "name": 1, "website": 1}).limit(MAX_COMPANIES)
+        async for company in cursor:
+            await queue.put(company)
+        for _ in range(SCRAPE_CONCURRENCY):
+            await queue.put(None)
+    
+    async def work():
+        nonlocal successful, failed, scraped
+        while True:
+            company = await queue.get()
+            if company is None:
+                return
             
-            jobs = await scraper.scrape_company(company_name, website)
+            company_name = company.get('name', '')
+            try:
+                jobs = await scraper.scrape_company(company_name, company.get('website'))
+            except Exception as e:
+                jobs = e
             
-            if jobs:
-                all_jobs.extend(jobs)
+            scraped += 1
+            prefix = f"[{scraped}/{total}] Scraping: {company_name[:50]}..."
+            
+            if isinstance(jobs, Exception):
+                failed += 1
+                print(f"{prefix} ❌ Error: {str(jobs)[:50]}")
+            elif jobs:
+                for job in jobs:
+                    if job['id'] and job['ats'] != 'generic':
+                        key = (job['ats'], job['id'])
+                    else:
+                        key = (job['company'], job['title'], job['url'])
+                    if key in seen_jobs:
+                        continue
+                    seen_jobs.add(key)
+                    all_jobs.append(job)
+                    company_counts[job['company']] += 1
                 successful += 1
-                print(f"✅ {len(jobs)} jobs")
+                print(f"{prefix} ✅ {len(jobs)} jobs")
             else:
                 failed += 1
-                print("❌ No jobs")
-            
-            # Rate limiting
-            await asyncio.sleep(1)
-            
-        except Exception as e:
-            failed += 1
-            print(f"❌ Error: {str(e)[:50]}")
+                print(f"{prefix} ❌ No jobs")
+    
+    await asyncio.gather(produce(), *[work() for _ in range(SCRAPE_CONCURRENCY)])
     
     await scraper.close()
     
@@ -335,21 +581,23 @@ async def main():
         print("=" * 100)
         print()
         
-        for i, job in enumerate(all_jobs[:100], 1):
-            print(f"{i}. {job['title']}")
-            print(f"   Company: {job['company']}")
-            print(f"   Location: {job['location']}")
-            print(f"   URL: {job['url'][:80]}...")
-            print(f"   Source: {job['ats']}")
-            print()
+        # Build the listing once and write it in a single call
+        print("\n".join(
+            f"{i}. {job['title']}\n"
+            f"   Company: {job['company']}\n"
+            f"   Location: {job['location']}\n"
+            f"   URL: {job['url'][:80]}...\n"
+            f"   Source: {job['ats']}\n"
+            for i, job in enumerate(all_jobs[:100], 1)
+        ))
         
         if len(all_jobs) > 100:
             print(f"... and {len(all_jobs) - 100} more jobs")
             print()
         
         # Save to file
-        with open('/app/backend/h1b_company_jobs.json', 'w') as f:
-            json.dump(all_jobs, f, indent=2)
+        with open('/app/backend/h1b_company_jobs.json', 'wb') as f:
+            f.write(orjson.dumps(all_jobs, option=orjson.OPT_INDENT_2))
         print(f"✅ All jobs saved to: /app/backend/h1b_company_jobs.json")
         
         # Company statistics
@@ -357,10 +605,7 @@ async def main():
         print("=" * 100)
         print("🏆 TOP COMPANIES BY JOB COUNT")
         print("=" * 100)
-        from collections import Counter
-        company_counts = Counter([job['company'] for job in all_jobs])
-        for company, count in company_counts.most_common(20):
-            print(f"{count:3d} jobs - {company}")
+        print("\n".join(f"{count:3d} jobs - {company}" for company, count in company_counts.most_common(20)))
     
     print()
     print("=" * 100)
@@ -368,4 +613,10 @@ async def main():
     print("=" * 100)
 
 if __name__ == "__main__":
+    # uvloop's libuv event loop schedules thousands of concurrent requests faster
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
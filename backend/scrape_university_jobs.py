@@ -4,11 +4,35 @@ Scrapes full-time jobs from all major US universities (H1B cap-exempt)
 """
 import asyncio
 import httpx
-from typing import List, Dict
-import json
+from typing import List, Dict, Optional
+import orjson
 from bs4 import BeautifulSoup
 import re
 from datetime import datetime, timezone
+from rate_limiter import HostRateLimiters
+from dns_cache import cached_dns_transport
+from url_utils import url_origin, fast_urljoin, fetch_capped_text
+
+# Number of universities scraped at the same time
+SCRAPE_CONCURRENCY = 20
+# Requests per second allowed against any single host (several universities share ATS hosts)
+HOST_RATE_LIMIT = 2
+# Bytes kept from each job page; the listings this scraper reads sit well within it
+MAX_PAGE_BYTES = 512 * 1024
+
+# Patterns used while scraping university job pages, compiled once
+JOB_ELEMENT_PATTERNS = [
+    ('a', {'href': re.compile(r'job|position|faculty|staff|career', re.I)}),
+    ('div', {'class': re.compile(r'job|position|vacancy', re.I)}),
+    ('tr', {'class': re.compile(r'job|position', re.I)}),
+]
+TITLE_CLASS_RE = re.compile(r'title|name|position', re.I)
+# Keyword alternations scan a lowercased title for every keyword in a single pass
+SKIP_KEYWORDS_RE = re.compile('student|part-time|temporary|adjunct|hourly|intern')
+INCLUDE_KEYWORDS_RE = re.compile(
+    'professor|researcher|scientist|engineer|analyst|developer|faculty|postdoc|'
+    'staff|coordinator|manager|director|specialist|technician'
+)
 
 # Top 200+ US Universities (H1B Cap-Exempt)
 US_UNIVERSITIES = [
@@ -76,76 +100,79 @@ class UniversityJobScraper:
     """Scrapes jobs from US universities (cap-exempt employers)"""
     
     def __init__(self):
+        # Many universities share an ATS host (Workday, Taleo, PeopleAdmin), so
+        # one HTTP/2 client lets them share its open connections
         self.http_client = httpx.AsyncClient(
             timeout=20.0,
             follow_redirects=True,
+            # DNS answers are reused for the whole run, see dns_cache.py
+            transport=cached_dns_transport(
+                http2=True,
+                limits=httpx.Limits(max_connections=200, max_keepalive_connections=100, keepalive_expiry=30)
+            ),
             headers={
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
         )
         self.jobs = []
+        self.host_limiters = HostRateLimiters(HOST_RATE_LIMIT)
     
     async def close(self):
         await self.http_client.aclose()
     
+    async def fetch_page(self, url: str) -> Optional[str]:
+        """GET a university job page through its host's rate limiter, truncated to MAX_PAGE_BYTES"""
+        async with self.host_limiters.for_url(url):
+            return await fetch_capped_text(self.http_client, url, MAX_PAGE_BYTES)
+    
     async def scrape_generic_university(self, university: Dict) -> List[Dict]:
         """Generic scraper for university job pages"""
         jobs = []
         
         try:
-            response = await self.http_client.get(university['url'])
-            
-            if response.status_code != 200:
+            html = await self.fetch_page(university['url'])
+            if html is None:
                 return []
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(html, 'lxml')
             
             # Look for job-related links and elements
             job_elements = []
             
             # Common patterns in university job pages
-            patterns = [
-                ('a', {'href': re.compile(r'job|position|faculty|staff|career', re.I)}),
-                ('div', {'class': re.compile(r'job|position|vacancy', re.I)}),
-                ('tr', {'class': re.compile(r'job|position', re.I)}),
-            ]
-            
-            for tag, attrs in patterns:
-                job_elements.extend(soup.find_all(tag, attrs)[:30])
+            for tag, attrs in JOB_ELEMENT_PATTERNS:
+                job_elements.extend(soup.find_all(tag, attrs, limit=30))
             
             # Extract job info
+            origin = url_origin(university['url'])
             for elem in job_elements:
                 try:
                     # Get title
-                    title_elem = elem.find(['h2', 'h3', 'h4', 'a', 'span'], class_=re.compile(r'title|name|position', re.I))
+                    title_elem = elem.find(['h2', 'h3', 'h4', 'a', 'span'], class_=TITLE_CLASS_RE)
                     if not title_elem:
                         title_elem = elem
                     
                     title = title_elem.get_text(strip=True)
+                    title_lc = title.lower()
                     
                     # Filter: Only full-time, academic/research/tech positions
                     if len(title) < 5 or len(title) > 150:
                         continue
                     
                     # Skip student, part-time, temporary positions
-                    skip_keywords = ['student', 'part-time', 'temporary', 'adjunct', 'hourly', 'intern']
-                    if any(keyword in title.lower() for keyword in skip_keywords):
+                    if SKIP_KEYWORDS_RE.search(title_lc):
                         continue
                     
                     # Include relevant positions
-                    include_keywords = ['professor', 'researcher', 'scientist', 'engineer', 'analyst', 
-                                      'developer', 'faculty', 'postdoc', 'staff', 'coordinator',
-                                      'manager', 'director', 'specialist', 'technician']
-                    if not any(keyword in title.lower() for keyword in include_keywords):
+                    if not INCLUDE_KEYWORDS_RE.search(title_lc):
                         continue
                     
                     # Get URL
                     link_elem = elem.find('a') if elem.name != 'a' else elem
                     job_url = link_elem.get('href') if link_elem else university['url']
                     
-                    if job_url and not job_url.startswith('http'):
-                        from urllib.parse import urljoin
-                        job_url = urljoin(university['url'], job_url)
+                    if job_url:
+                        job_url = fast_urljoin(university['url'], origin, job_url)
                     
                     jobs.append({
                         'title': title,
@@ -171,23 +198,29 @@ class UniversityJobScraper:
         all_jobs = []
         successful = 0
         
-        for i, university in enumerate(US_UNIVERSITIES, 1):
-            try:
-                print(f"[{i}/{len(US_UNIVERSITIES)}] {university['name'][:50]:<50}", end=' ', flush=True)
-                
-                jobs = await self.scrape_generic_university(university)
-                
-                if jobs:
-                    all_jobs.extend(jobs)
-                    successful += 1
-                    print(f"✅ {len(jobs)} jobs")
-                else:
-                    print("❌ No jobs")
-                
-                await asyncio.sleep(1)  # Rate limiting
-                
-            except Exception as e:
-                print(f"❌ Error")
+        # Scrape universities concurrently; they live on different domains
+        semaphore = asyncio.Semaphore(SCRAPE_CONCURRENCY)
+        
+        async def bound_scrape(university: Dict) -> List[Dict]:
+            async with semaphore:
+                return await self.scrape_generic_university(university)
+        
+        results = await asyncio.gather(*[bound_scrape(u) for u in US_UNIVERSITIES], return_exceptions=True)
+        
+        # Collect the per-university lines and write them in one call
+        lines = []
+        for i, (university, jobs) in enumerate(zip(US_UNIVERSITIES, results), 1):
+            prefix = f"[{i}/{len(US_UNIVERSITIES)}] {university['name'][:50]:<50}"
+            
+            if isinstance(jobs, Exception):
+                lines.append(f"{prefix} ❌ Error")
+            elif jobs:
+                all_jobs.extend(jobs)
+                successful += 1
+                lines.append(f"{prefix} ✅ {len(jobs)} jobs")
+            else:
+                lines.append(f"{prefix} ❌ No jobs")
+        print("\n".join(lines))
         
         print()
         print("=" * 80)
@@ -209,8 +242,8 @@ async def main():
     await scraper.close()
     
     # Save to file
-    with open('/app/backend/university_jobs.json', 'w') as f:
-        json.dump(jobs, f, indent=2)
+    with open('/app/backend/university_jobs.json', 'wb') as f:
+        f.write(orjson.dumps(jobs, option=orjson.OPT_INDENT_2))
     
     print()
     print(f"✅ Jobs saved to: /app/backend/university_jobs.json")
@@ -222,11 +255,13 @@ async def main():
         print("📋 SAMPLE JOBS (First 30):")
         print("=" * 80)
         
-        for i, job in enumerate(jobs[:30], 1):
-            print(f"\n{i}. {job['title']}")
-            print(f"   University: {job['university']}")
-            print(f"   Type: {job['type']} (H1B Cap-Exempt)")
-            print(f"   URL: {job['url'][:70]}...")
+        print("".join(
+            f"\n{i}. {job['title']}\n"
+            f"   University: {job['university']}\n"
+            f"   Type: {job['type']} (H1B Cap-Exempt)\n"
+            f"   URL: {job['url'][:70]}..."
+            for i, job in enumerate(jobs[:30], 1)
+        ))
     
     print()
     print("=" * 80)
@@ -234,4 +269,10 @@ async def main():
     print("=" * 80)
 
 if __name__ == "__main__":
+    # Use uvloop when it is installed; the default event loop works too
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
@@ -1,15 +1,23 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, Request, Response
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Request, Response, Body
+from fastapi.responses import JSONResponse, ORJSONResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReplaceOne
+from pymongo.errors import DuplicateKeyError
 import os
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict
 from typing import List, Optional
 import uuid
-from datetime import datetime, timezone
+import re
+from collections import OrderedDict
+import base64
+import orjson
+import time
+import asyncio
+from datetime import datetime, timedelta, timezone
 import httpx
 
 ROOT_DIR = Path(__file__).parent
@@ -17,11 +25,27 @@ load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+# One pooled client shared by the API and the job aggregator; compression
+# shrinks the job documents written on every sync. Dates are stored as BSON dates
+# and read back as UTC-aware datetimes.
+client = AsyncIOMotorClient(
+    mongo_url,
+    maxPoolSize=50,
+    # Keep warm connections so the first requests after startup skip the handshake
+    minPoolSize=10,
+    # Fail fast instead of hanging requests when the server or the pool is unavailable
+    serverSelectionTimeoutMS=2000,
+    waitQueueTimeoutMS=1000,
+    compressors="zstd,zlib",
+    retryWrites=True,
+    tz_aware=True
+)
 db = client[os.environ['DB_NAME']]
 
 # Create the main app
-app = FastAPI(title="H1B Job Board API")
+# orjson encodes every JSON response; handlers returning raw Mongo dicts also
+# wrap them in ORJSONResponse themselves to skip jsonable_encoder
+app = FastAPI(title="H1B Job Board API", default_response_class=ORJSONResponse)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -41,6 +65,9 @@ from job_scheduler import JobScheduler
 job_aggregator = None
 job_scheduler = None
 
+# Shared client for the auth service, so logins reuse a warm connection (created on startup)
+auth_http_client = None
+
 # ================== MODELS ==================
 
 class User(BaseModel):
@@ -117,8 +144,75 @@ class JobApplication(BaseModel):
     notes: Optional[str] = None
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
+class ApplicationCreate(BaseModel):
+    notes: Optional[str] = None
+
+# ================== INDEXES ==================
+
+# Lifetime of a login session and its cookie
+SESSION_TTL = timedelta(days=7)
+
+# Searches shorter than this match as a title prefix; the text index only matches whole words
+MIN_TEXT_SEARCH_LENGTH = 3
+
+# (collection, keys, options) for every index the API queries rely on. The job list
+# indexes follow its filters and then its (is_external, posted_date) sort, so pages are
+# read in index order instead of sorted in memory.
+API_INDEXES = [
+    ("jobs", [("job_title", "text"), ("company_name", "text"), ("location", "text")], {"name": "jobs_text"}),
+    ("jobs", [("is_external", -1), ("posted_date", -1), ("job_id", 1)], {}),
+    ("jobs", [("state", 1), ("is_external", -1), ("posted_date", -1)], {}),
+    ("jobs", [("wage_level", 1), ("is_external", -1), ("posted_date", -1)], {}),
+    ("jobs", [("state", 1), ("wage_level", 1), ("is_external", -1), ("posted_date", -1)], {}),
+    ("jobs", [("base_salary", 1)], {}),
+    ("jobs", [("company_id", 1)], {}),
+    ("jobs", [("company_name", 1)], {}),
+    ("companies", [("name", "text")], {"name": "companies_text"}),
+    ("companies", [("company_id", 1)], {}),
+    ("companies", [("h1b_approvals", -1)], {}),
+    ("user_sessions", [("session_token", 1)], {"unique": True}),
+    ("user_sessions", [("user_id", 1)], {}),
+    # MongoDB deletes sessions once expires_at passes, so the collection only holds live ones
+    ("user_sessions", [("expires_at", 1)], {"expireAfterSeconds": 0}),
+    ("users", [("user_id", 1)], {"unique": True}),
+    ("users", [("email", 1)], {}),
+    ("saved_jobs", [("user_id", 1), ("job_id", 1)], {"unique": True}),
+    ("applications", [("user_id", 1), ("job_id", 1)], {"unique": True}),
+    ("applications", [("application_id", 1)], {}),
+]
+
+async def ensure_indexes():
+    """Create the indexes the API queries rely on"""
+    for collection, keys, options in API_INDEXES:
+        # One failing index (e.g. existing duplicates) should not block the rest
+        try:
+            await db[collection].create_index(keys, **options)
+        except Exception as e:
+            logger.error(f"Error creating index {keys} on {collection}: {e}")
+
 # ================== AUTH HELPERS ==================
 
+# Only the fields the User model holds
+USER_PROJECTION = {"_id": 0, "user_id": 1, "email": 1, "name": 1, "picture": 1, "created_at": 1}
+
+# Recently resolved sessions, so authenticated requests skip both MongoDB lookups.
+# Entries live for SESSION_CACHE_TTL seconds, which bounds how long a logout handled
+# by another worker process can go unnoticed here.
+SESSION_CACHE_TTL = 60
+SESSION_CACHE_MAX_SIZE = 10000
+session_cache = {}  # session_token -> (user, expires_at, cached_until)
+
+def cache_session(session_token: str, user: User, expires_at: datetime):
+    """Remember a resolved session"""
+    if len(session_cache) >= SESSION_CACHE_MAX_SIZE:
+        session_cache.clear()
+    session_cache[session_token] = (user, expires_at, time.monotonic() + SESSION_CACHE_TTL)
+
+def forget_user_sessions(user_id: str):
+    """Drop every cached session belonging to a user"""
+    for token in [token for token, (user, _, _) in session_cache.items() if user.user_id == user_id]:
+        session_cache.pop(token, None)
+
 async def get_current_user(request: Request) -> Optional[User]:
     """Get current user from session token (cookie or header)"""
     session_token = request.cookies.get("session_token")
@@ -130,30 +224,40 @@ async def get_current_user(request: Request) -> Optional[User]:
     if not session_token:
         return None
     
+    cached = session_cache.get(session_token)
+    if cached:
+        user, expires_at, cached_until = cached
+        if cached_until > time.monotonic() and expires_at > datetime.now(timezone.utc):
+            return user
+        session_cache.pop(session_token, None)
+    
     session_doc = await db.user_sessions.find_one(
         {"session_token": session_token},
-        {"_id": 0}
+        {"_id": 0, "user_id": 1, "expires_at": 1}
     )
     if not session_doc:
         return None
     
-    # Check expiry
+    # Check expiry. The TTL index removes expired sessions, but its reaper runs about
+    # once a minute; sessions created before dates were stored natively hold ISO strings.
     expires_at = session_doc["expires_at"]
     if isinstance(expires_at, str):
         expires_at = datetime.fromisoformat(expires_at)
-    if expires_at.tzinfo is None:
-        expires_at = expires_at.replace(tzinfo=timezone.utc)
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
     if expires_at < datetime.now(timezone.utc):
         return None
     
     user_doc = await db.users.find_one(
         {"user_id": session_doc["user_id"]},
-        {"_id": 0}
+        USER_PROJECTION
     )
     if not user_doc:
         return None
     
-    return User(**user_doc)
+    user = User.model_validate(user_doc)
+    cache_session(session_token, user, expires_at)
+    return user
 
 async def require_auth(request: Request) -> User:
     """Require authentication"""
@@ -174,25 +278,25 @@ async def create_session(request: Request, response: Response):
         raise HTTPException(status_code=400, detail="session_id required")
     
     # Call Emergent auth service
-    async with httpx.AsyncClient() as client:
-        try:
-            auth_response = await client.get(
-                "https://demobackend.emergentagent.com/auth/v1/env/oauth/session-data",
-                headers={"X-Session-ID": session_id}
-            )
-            if auth_response.status_code != 200:
-                raise HTTPException(status_code=401, detail="Invalid session_id")
-            
-            auth_data = auth_response.json()
-        except Exception as e:
-            logger.error(f"Auth error: {e}")
-            raise HTTPException(status_code=401, detail="Authentication failed")
+    try:
+        auth_response = await auth_http_client.get(
+            "https://demobackend.emergentagent.com/auth/v1/env/oauth/session-data",
+            headers={"X-Session-ID": session_id}
+        )
+        if auth_response.status_code != 200:
+            raise HTTPException(status_code=401, detail="Invalid session_id")
+        
+        auth_data = auth_response.json()
+    except Exception as e:
+        logger.error(f"Auth error: {e}")
+        raise HTTPException(status_code=401, detail="Authentication failed")
     
     user_id = f"user_{uuid.uuid4().hex[:12]}"
     session_token = auth_data.get("session_token")
+    now = datetime.now(timezone.utc)
     
     # Check if user exists
-    existing_user = await db.users.find_one({"email": auth_data["email"]}, {"_id": 0})
+    existing_user = await db.users.find_one({"email": auth_data["email"]}, {"_id": 0, "user_id": 1})
     if existing_user:
         user_id = existing_user["user_id"]
     else:
@@ -202,18 +306,20 @@ async def create_session(request: Request, response: Response):
             "email": auth_data["email"],
             "name": auth_data.get("name", ""),
             "picture": auth_data.get("picture", ""),
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": now
         }
         await db.users.insert_one(user_doc)
     
     # Store session
+    expires_at = now + SESSION_TTL
     session_doc = {
         "user_id": user_id,
         "session_token": session_token,
-        "expires_at": (datetime.now(timezone.utc) + __import__('datetime').timedelta(days=7)).isoformat(),
-        "created_at": datetime.now(timezone.utc).isoformat()
+        "expires_at": expires_at,
+        "created_at": now
     }
     await db.user_sessions.delete_many({"user_id": user_id})
+    forget_user_sessions(user_id)
     await db.user_sessions.insert_one(session_doc)
     
     # Set cookie
@@ -224,19 +330,19 @@ async def create_session(request: Request, response: Response):
         secure=True,
         samesite="none",
         path="/",
-        max_age=7*24*60*60
+        max_age=int(SESSION_TTL.total_seconds())
     )
     
     user_doc = await db.users.find_one({"user_id": user_id}, {"_id": 0})
+    if user_doc:
+        cache_session(session_token, User.model_validate(user_doc), expires_at)
     return user_doc
 
 @api_router.get("/auth/me")
-async def get_me(request: Request):
+async def get_me(user: User = Depends(require_auth)):
     """Get current user"""
-    user = await get_current_user(request)
-    if not user:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    return user.model_dump()
+    # JSON mode serializes the datetime in pydantic-core, leaving FastAPI only plain values
+    return user.model_dump(mode="json")
 
 @api_router.post("/auth/logout")
 async def logout(request: Request, response: Response):
@@ -244,11 +350,108 @@ async def logout(request: Request, response: Response):
     session_token = request.cookies.get("session_token")
     if session_token:
         await db.user_sessions.delete_many({"session_token": session_token})
+        session_cache.pop(session_token, None)
     response.delete_cookie("session_token", path="/", samesite="none", secure=True)
     return {"message": "Logged out"}
 
 # ================== JOB ROUTES ==================
 
+# Job list order: external jobs first, then newest, with job_id breaking ties so
+# every job has a stable position for keyset pagination
+JOB_LIST_SORT = [
+    ("is_external", -1),
+    ("posted_date", -1),
+    ("job_id", 1)
+]
+
+# Fields the job list cards render, plus the sort keys the cursor needs; the
+# description is cut to the preview length the cards clamp it to anyway
+JOB_LIST_PROJECTION = {
+    "_id": 0,
+    "job_id": 1,
+    "job_title": 1,
+    "company_name": 1,
+    "company_id": 1,
+    "location": 1,
+    "state": 1,
+    "wage_level": 1,
+    "base_salary": 1,
+    "posted_date": 1,
+    "employment_type": 1,
+    "is_external": 1,
+    "source": 1,
+    "external_url": 1,
+    "cap_exempt": 1,
+    "job_description": {"$substrCP": ["$job_description", 0, 300]}
+}
+
+# Title keywords per category for the /jobs filter, compiled once
+JOB_CATEGORY_KEYWORDS = {
+    "software": ["software", "engineer", "developer", "programmer"],
+    "data": ["data", "scientist", "analyst", "analytics"],
+    "cloud": ["cloud", "devops", "infrastructure", "sre", "site reliability"],
+    "security": ["security", "cybersecurity", "infosec"],
+    "product": ["product manager", "product owner", "pm"],
+    "design": ["designer", "ux", "ui", "design"],
+    "mobile": ["mobile", "ios", "android", "react native"],
+    "frontend": ["frontend", "front-end", "react", "vue", "angular"],
+    "backend": ["backend", "back-end", "api", "microservices"],
+    "fullstack": ["fullstack", "full-stack", "full stack"],
+    "ml": ["machine learning", "ml", "ai", "artificial intelligence"],
+    "hardware": ["hardware", "embedded", "firmware"],
+    "qa": ["qa", "quality", "test", "sdet"]
+}
+JOB_CATEGORY_FILTERS = {
+    category: re.compile("|".join(keywords), re.IGNORECASE)
+    for category, keywords in JOB_CATEGORY_KEYWORDS.items()
+}
+
+# Categories listed with counts by /jobs/categories
+JOB_CATEGORIES = [
+    {"id": "software", "name": "Software Engineering", "keywords": ["software", "engineer", "developer"]},
+    {"id": "data", "name": "Data & Analytics", "keywords": ["data", "scientist", "analyst"]},
+    {"id": "cloud", "name": "Cloud & DevOps", "keywords": ["cloud", "devops", "infrastructure"]},
+    {"id": "security", "name": "Security", "keywords": ["security", "cybersecurity"]},
+    {"id": "product", "name": "Product Management", "keywords": ["product manager", "pm"]},
+    {"id": "design", "name": "Design", "keywords": ["designer", "ux", "ui"]},
+    {"id": "mobile", "name": "Mobile Development", "keywords": ["mobile", "ios", "android"]},
+    {"id": "frontend", "name": "Frontend", "keywords": ["frontend", "react", "vue"]},
+    {"id": "backend", "name": "Backend", "keywords": ["backend", "api", "microservices"]},
+    {"id": "fullstack", "name": "Full Stack", "keywords": ["fullstack", "full stack"]},
+    {"id": "ml", "name": "Machine Learning / AI", "keywords": ["machine learning", "ml", "ai"]},
+    {"id": "hardware", "name": "Hardware", "keywords": ["hardware", "embedded"]},
+    {"id": "qa", "name": "QA / Testing", "keywords": ["qa", "test", "quality"]}
+]
+for cat in JOB_CATEGORIES:
+    cat["pattern"] = re.compile("|".join(cat["keywords"]), re.IGNORECASE)
+
+REGEX_METACHARS_RE = re.compile(r'[.^$*+?{}\[\]\\|()]')
+
+def encode_jobs_cursor(job: dict) -> str:
+    """Encode a job's sort key as an opaque `after` cursor"""
+    key = [job.get("is_external"), job.get("posted_date"), job.get("job_id")]
+    return base64.urlsafe_b64encode(orjson.dumps(key)).decode()
+
+def jobs_after_filter(after: str) -> dict:
+    """Build the filter matching jobs that sort after an `after` cursor"""
+    try:
+        is_external, posted_date, job_id = orjson.loads(base64.urlsafe_b64decode(after))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    # Internal jobs may lack is_external; descending it sorts true, then false, then missing
+    if is_external:
+        later = [{"is_external": {"$ne": True}}]
+    elif is_external is False:
+        later = [{"is_external": None}]
+    else:
+        later = []
+    
+    return {"$or": later + [
+        {"is_external": is_external, "posted_date": {"$lt": posted_date}},
+        {"is_external": is_external, "posted_date": posted_date, "job_id": {"$gt": job_id}}
+    ]}
+
 @api_router.get("/jobs")
 async def get_jobs(
     search: Optional[str] = None,
@@ -261,17 +464,23 @@ async def get_jobs(
     opt_friendly: Optional[bool] = None,
     stem_opt_friendly: Optional[bool] = None,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    after: Optional[str] = None,
+    full: bool = False
 ):
-    """Get jobs with filters including OPT/STEM OPT"""
+    """Get jobs with filters including OPT/STEM OPT.
+    
+    Pass the returned next_after as `after` to fetch the next page; it costs the same
+    at any depth. `skip` still works but is deprecated, as it scans every skipped job.
+    Jobs carry only the fields list cards show unless `full` is set.
+    """
     query = {}
     
     if search:
-        query["$or"] = [
-            {"job_title": {"$regex": search, "$options": "i"}},
-            {"company_name": {"$regex": search, "$options": "i"}},
-            {"location": {"$regex": search, "$options": "i"}}
-        ]
+        if len(search) >= MIN_TEXT_SEARCH_LENGTH:
+            query["$text"] = {"$search": search}
+        else:
+            query["job_title"] = {"$regex": f"^{re.escape(search)}", "$options": "i"}
     
     if state:
         query["state"] = state
@@ -289,29 +498,21 @@ async def get_jobs(
             query["base_salary"] = {"$lte": max_salary}
     
     if company:
-        query["company_name"] = {"$regex": company, "$options": "i"}
+        # Plain names match as an anchored prefix; anything else is matched literally
+        if REGEX_METACHARS_RE.search(company):
+            query["company_name"] = {"$regex": re.escape(company), "$options": "i"}
+        else:
+            query["company_name"] = {"$regex": f"^{re.escape(company)}", "$options": "i"}
     
     # Category filter
     if category:
-        category_keywords = {
-            "software": ["software", "engineer", "developer", "programmer"],
-            "data": ["data", "scientist", "analyst", "analytics"],
-            "cloud": ["cloud", "devops", "infrastructure", "sre", "site reliability"],
-            "security": ["security", "cybersecurity", "infosec"],
-            "product": ["product manager", "product owner", "pm"],
-            "design": ["designer", "ux", "ui", "design"],
-            "mobile": ["mobile", "ios", "android", "react native"],
-            "frontend": ["frontend", "front-end", "react", "vue", "angular"],
-            "backend": ["backend", "back-end", "api", "microservices"],
-            "fullstack": ["fullstack", "full-stack", "full stack"],
-            "ml": ["machine learning", "ml", "ai", "artificial intelligence"],
-            "hardware": ["hardware", "embedded", "firmware"],
-            "qa": ["qa", "quality", "test", "sdet"]
-        }
-        
-        if category in category_keywords:
-            keywords = category_keywords[category]
-            query["job_title"] = {"$regex": "|".join(keywords), "$options": "i"}
+        category_filter = JOB_CATEGORY_FILTERS.get(category)
+        if category_filter:
+            if "job_title" in query:
+                # A short search already constrains the title; both must hold
+                query.setdefault("$and", []).append({"job_title": category_filter})
+            else:
+                query["job_title"] = category_filter
     
     # OPT/STEM OPT filter - check if company supports OPT
     if opt_friendly or stem_opt_friendly:
@@ -333,50 +534,55 @@ async def get_jobs(
                 # Combine with existing company filter
                 existing_regex = query["company_name"].get("$regex")
                 if existing_regex:
-                    query["$and"] = [
+                    query.setdefault("$and", []).extend([
                         {"company_name": {"$regex": existing_regex, "$options": "i"}},
                         {"company_name": {"$in": opt_company_names}}
-                    ]
+                    ])
                 else:
                     query["company_name"] = {"$in": opt_company_names}
     
-    # Sort by: 1) external jobs first (is_external DESC), 2) posted_date DESC
-    cursor = db.jobs.find(query, {"_id": 0}).skip(skip).limit(limit).sort([
-        ("is_external", -1),  # External jobs first
-        ("posted_date", -1)   # Then by date
+    # Keyset pagination: resume right after the cursor instead of skipping
+    page_stages = []
+    if after:
+        page_stages.append({"$match": jobs_after_filter(after)})
+        skip = 0
+    page_stages.extend([
+        {"$sort": dict(JOB_LIST_SORT)},
+        {"$skip": skip},
+        {"$limit": limit},
+        {"$project": {"_id": 0} if full else JOB_LIST_PROJECTION}
     ])
-    jobs = await cursor.to_list(length=limit)
     
-    total = await db.jobs.count_documents(query)
+    if query:
+        # Page and total in one round trip, evaluating the filter once
+        pipeline = [
+            {"$match": query},
+            {"$facet": {
+                "jobs": page_stages,
+                "total": [{"$count": "count"}]
+            }}
+        ]
+        result = (await db.jobs.aggregate(pipeline).to_list(1))[0]
+        jobs = result["jobs"]
+        total = result["total"][0]["count"] if result["total"] else 0
+    else:
+        # Unfiltered: the collection metadata already knows the total
+        jobs, total = await asyncio.gather(
+            db.jobs.aggregate(page_stages).to_list(length=limit),
+            db.jobs.estimated_document_count()
+        )
     
-    return {"jobs": jobs, "total": total, "skip": skip, "limit": limit}
+    next_after = encode_jobs_cursor(jobs[-1]) if len(jobs) == limit else None
+    
+    return ORJSONResponse({"jobs": jobs, "total": total, "skip": skip, "limit": limit, "next_after": next_after})
 
 @api_router.get("/jobs/categories")
 async def get_job_categories():
     """Get job categories with counts"""
-    categories = [
-        {"id": "software", "name": "Software Engineering", "keywords": ["software", "engineer", "developer"]},
-        {"id": "data", "name": "Data & Analytics", "keywords": ["data", "scientist", "analyst"]},
-        {"id": "cloud", "name": "Cloud & DevOps", "keywords": ["cloud", "devops", "infrastructure"]},
-        {"id": "security", "name": "Security", "keywords": ["security", "cybersecurity"]},
-        {"id": "product", "name": "Product Management", "keywords": ["product manager", "pm"]},
-        {"id": "design", "name": "Design", "keywords": ["designer", "ux", "ui"]},
-        {"id": "mobile", "name": "Mobile Development", "keywords": ["mobile", "ios", "android"]},
-        {"id": "frontend", "name": "Frontend", "keywords": ["frontend", "react", "vue"]},
-        {"id": "backend", "name": "Backend", "keywords": ["backend", "api", "microservices"]},
-        {"id": "fullstack", "name": "Full Stack", "keywords": ["fullstack", "full stack"]},
-        {"id": "ml", "name": "Machine Learning / AI", "keywords": ["machine learning", "ml", "ai"]},
-        {"id": "hardware", "name": "Hardware", "keywords": ["hardware", "embedded"]},
-        {"id": "qa", "name": "QA / Testing", "keywords": ["qa", "test", "quality"]}
-    ]
-    
     # Get counts for each category
     result = []
-    for cat in categories:
-        regex = "|".join(cat["keywords"])
-        count = await db.jobs.count_documents({
-            "job_title": {"$regex": regex, "$options": "i"}
-        })
+    for cat in JOB_CATEGORIES:
+        count = await db.jobs.count_documents({"job_title": cat["pattern"]})
         result.append({
             "id": cat["id"],
             "name": cat["name"],
@@ -385,18 +591,28 @@ async def get_job_categories():
     
     return {"categories": result}
 
-@api_router.get("/jobs/wage-prediction")
-async def predict_wage_level_endpoint(
-    job_title: str,
-    state: str = "CA",
-    salary: float = 0
-):
-    """AI-powered wage level prediction"""
+# Predictions depend only on the query and the static OFLC tables, so repeated
+# (job_title, state, salary) lookups are served from a bounded LRU cache
+WAGE_PREDICTION_CACHE_SIZE = 10000
+WAGE_PREDICTION_CACHE_TTL = 600
+wage_prediction_cache = OrderedDict()  # (job_title, state, salary) -> (cached_until, prediction)
+
+# Held while OFLC data loads so concurrent cold requests parse the CSVs only once
+wage_data_lock = asyncio.Lock()
+
+async def ensure_wage_data() -> bool:
+    """Load OFLC wage data in a worker thread if it isn't loaded yet"""
     from wage_predictor import wage_predictor
     
-    # Load data if not already loaded
     if not wage_predictor.loaded:
-        wage_predictor.load_data()
+        async with wage_data_lock:
+            if not wage_predictor.loaded:
+                await asyncio.to_thread(wage_predictor.load_data)
+    return wage_predictor.loaded
+
+def compute_wage_prediction(job_title: str, state: str, salary: float) -> dict:
+    """Predict the wage level and OFLC ranges for one job"""
+    from wage_predictor import wage_predictor
     
     # Predict wage level
     predicted_level = wage_predictor.predict_wage_level(job_title, state, salary)
@@ -417,13 +633,34 @@ async def predict_wage_level_endpoint(
             "max": round(max_salary, 2)
         },
         "oflc_wage_levels": {
-            "level1": round(wage_levels.get('level1', 0), 2) if wage_levels else 0,
-            "level2": round(wage_levels.get('level2', 0), 2) if wage_levels else 0,
-            "level3": round(wage_levels.get('level3', 0), 2) if wage_levels else 0,
-            "level4": round(wage_levels.get('level4', 0), 2) if wage_levels else 0,
+            level: round(wage, 2) for level, wage in wage_levels.items()
         } if wage_levels else None
     }
 
+@api_router.get("/jobs/wage-prediction")
+async def predict_wage_level_endpoint(
+    job_title: str,
+    state: str = "CA",
+    salary: float = 0
+):
+    """AI-powered wage level prediction"""
+    key = (job_title, state, salary)
+    cached = wage_prediction_cache.get(key)
+    if cached and cached[0] > time.monotonic():
+        wage_prediction_cache.move_to_end(key)
+        return cached[1]
+    
+    loaded = await ensure_wage_data()
+    prediction = compute_wage_prediction(job_title, state, salary)
+    if not loaded:
+        # Fallback estimates are not cached so the next request retries loading OFLC data
+        return prediction
+    wage_prediction_cache[key] = (time.monotonic() + WAGE_PREDICTION_CACHE_TTL, prediction)
+    wage_prediction_cache.move_to_end(key)
+    if len(wage_prediction_cache) > WAGE_PREDICTION_CACHE_SIZE:
+        wage_prediction_cache.popitem(last=False)
+    return prediction
+
 @api_router.get("/jobs/{job_id}")
 async def get_job(job_id: str):
     """Get single job"""
@@ -432,6 +669,21 @@ async def get_job(job_id: str):
         raise HTTPException(status_code=404, detail="Job not found")
     return job
 
+# Stats change slowly, so their aggregations are cached as encoded JSON for a short while
+STATS_CACHE_TTL = 60
+stats_cache = {}  # key -> (cached_until, encoded stats)
+
+async def cached_stats(key: str, pipeline: list) -> Response:
+    """Run a jobs stats aggregation, reusing its encoded result for STATS_CACHE_TTL seconds"""
+    cached = stats_cache.get(key)
+    if cached and cached[0] > time.monotonic():
+        content = cached[1]
+    else:
+        stats = await db.jobs.aggregate(pipeline).to_list(None)
+        content = orjson.dumps(stats)
+        stats_cache[key] = (time.monotonic() + STATS_CACHE_TTL, content)
+    return Response(content=content, media_type="application/json")
+
 @api_router.get("/jobs/stats/wage-levels")
 async def get_wage_stats():
     """Get wage level statistics"""
@@ -448,8 +700,7 @@ async def get_wage_stats():
         {"$sort": {"_id": 1}}
     ]
     
-    stats = await db.jobs.aggregate(pipeline).to_list(None)
-    return stats
+    return await cached_stats("wage_levels", pipeline)
 
 @api_router.get("/jobs/stats/by-state")
 async def get_state_stats():
@@ -466,8 +717,7 @@ async def get_state_stats():
         {"$limit": 10}
     ]
     
-    stats = await db.jobs.aggregate(pipeline).to_list(None)
-    return stats
+    return await cached_stats("by_state", pipeline)
 
 # ================== COMPANY ROUTES ==================
 
@@ -482,7 +732,10 @@ async def get_companies(
     query = {}
     
     if search:
-        query["name"] = {"$regex": search, "$options": "i"}
+        if len(search) >= MIN_TEXT_SEARCH_LENGTH:
+            query["$text"] = {"$search": search}
+        else:
+            query["name"] = {"$regex": f"^{re.escape(search)}", "$options": "i"}
     
     if industry:
         query["industry"] = industry
@@ -492,56 +745,113 @@ async def get_companies(
     
     total = await db.companies.count_documents(query)
     
-    return {"companies": companies, "total": total}
+    return ORJSONResponse({"companies": companies, "total": total})
+
+# Company pages change only on seed or sync, so recently viewed ones are served from
+# a small LRU cache for COMPANY_CACHE_TTL seconds
+COMPANY_CACHE_SIZE = 512
+COMPANY_CACHE_TTL = 300
+company_cache = OrderedDict()  # company_id -> (cached_until, {"company": ..., "jobs": ...})
 
 @api_router.get("/companies/{company_id}")
 async def get_company(company_id: str):
     """Get single company with job listings"""
-    company = await db.companies.find_one({"company_id": company_id}, {"_id": 0})
-    if not company:
+    cached = company_cache.get(company_id)
+    if cached and cached[0] > time.monotonic():
+        company_cache.move_to_end(company_id)
+        return cached[1]
+    
+    # The company and up to 10 of its jobs in one round trip
+    pipeline = [
+        {"$match": {"company_id": company_id}},
+        {"$limit": 1},
+        {"$lookup": {
+            "from": "jobs",
+            "localField": "company_id",
+            "foreignField": "company_id",
+            "as": "jobs",
+            "pipeline": [{"$limit": 10}, {"$project": JOB_LIST_PROJECTION}]
+        }},
+        {"$project": {"_id": 0}}
+    ]
+    result = await db.companies.aggregate(pipeline).to_list(1)
+    if not result:
         raise HTTPException(status_code=404, detail="Company not found")
     
-    # Get company's jobs
-    jobs = await db.jobs.find({"company_id": company_id}, {"_id": 0}).limit(10).to_list(length=10)
+    company = result[0]
+    jobs = company.pop("jobs")
     
-    return {"company": company, "jobs": jobs}
+    detail = {"company": company, "jobs": jobs}
+    company_cache[company_id] = (time.monotonic() + COMPANY_CACHE_TTL, detail)
+    company_cache.move_to_end(company_id)
+    if len(company_cache) > COMPANY_CACHE_SIZE:
+        company_cache.popitem(last=False)
+    return detail
 
 # ================== SAVED JOBS ROUTES ==================
 
+# Job fields the dashboard shows next to saved jobs and applications
+JOB_SUMMARY_PROJECTION = {
+    "_id": 0,
+    "job_id": 1,
+    "job_title": 1,
+    "company_name": 1,
+    "location": 1,
+    "base_salary": 1,
+    "wage_level": 1,
+    "posted_date": 1
+}
+
+async def find_with_jobs(collection, user_id: str, limit: int = 100):
+    """Get a user's saved jobs or applications joined with their job summaries in one query"""
+    pipeline = [
+        {"$match": {"user_id": user_id}},
+        {"$limit": limit},
+        {"$lookup": {
+            "from": "jobs",
+            "localField": "job_id",
+            "foreignField": "job_id",
+            "as": "job",
+            "pipeline": [{"$project": JOB_SUMMARY_PROJECTION}]
+        }},
+        {"$project": {"_id": 0}}
+    ]
+    
+    items = []
+    jobs = []
+    async for doc in collection.aggregate(pipeline):
+        job = doc.pop("job")
+        if job:
+            jobs.append(job[0])
+        items.append(doc)
+    return items, jobs
+
 @api_router.get("/saved-jobs")
-async def get_saved_jobs(request: Request):
+async def get_saved_jobs(user: User = Depends(require_auth)):
     """Get user's saved jobs"""
-    user = await require_auth(request)
     
-    saved = await db.saved_jobs.find({"user_id": user.user_id}, {"_id": 0}).to_list(100)
-    
-    # Get full job details
-    job_ids = [s["job_id"] for s in saved]
-    jobs = await db.jobs.find({"job_id": {"$in": job_ids}}, {"_id": 0}).to_list(100)
+    saved, jobs = await find_with_jobs(db.saved_jobs, user.user_id)
     
     return {"saved_jobs": saved, "jobs": jobs}
 
 @api_router.post("/saved-jobs/{job_id}")
-async def save_job(job_id: str, request: Request):
+async def save_job(job_id: str, user: User = Depends(require_auth)):
     """Save a job"""
-    user = await require_auth(request)
-    
-    # Check if already saved
-    existing = await db.saved_jobs.find_one({"user_id": user.user_id, "job_id": job_id})
-    if existing:
-        raise HTTPException(status_code=400, detail="Job already saved")
     
     saved = SavedJob(user_id=user.user_id, job_id=job_id)
     doc = saved.model_dump()
-    doc["saved_at"] = doc["saved_at"].isoformat()
-    await db.saved_jobs.insert_one(doc)
+    
+    # The unique (user_id, job_id) index rejects duplicates atomically
+    try:
+        await db.saved_jobs.insert_one(doc)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Job already saved")
     
     return {"message": "Job saved", "saved_id": saved.saved_id}
 
 @api_router.delete("/saved-jobs/{job_id}")
-async def unsave_job(job_id: str, request: Request):
+async def unsave_job(job_id: str, user: User = Depends(require_auth)):
     """Remove saved job"""
-    user = await require_auth(request)
     
     result = await db.saved_jobs.delete_one({"user_id": user.user_id, "job_id": job_id})
     if result.deleted_count == 0:
@@ -552,46 +862,38 @@ async def unsave_job(job_id: str, request: Request):
 # ================== APPLICATION ROUTES ==================
 
 @api_router.get("/applications")
-async def get_applications(request: Request):
+async def get_applications(user: User = Depends(require_auth)):
     """Get user's job applications"""
-    user = await require_auth(request)
     
-    applications = await db.applications.find({"user_id": user.user_id}, {"_id": 0}).to_list(100)
-    
-    # Get job details
-    job_ids = [a["job_id"] for a in applications]
-    jobs = await db.jobs.find({"job_id": {"$in": job_ids}}, {"_id": 0}).to_list(100)
+    applications, jobs = await find_with_jobs(db.applications, user.user_id)
     
     return {"applications": applications, "jobs": jobs}
 
 @api_router.post("/applications/{job_id}")
-async def create_application(job_id: str, request: Request):
+async def create_application(job_id: str, user: User = Depends(require_auth), body: Optional[ApplicationCreate] = Body(None)):
     """Create job application"""
-    user = await require_auth(request)
-    
-    # Check if already applied
-    existing = await db.applications.find_one({"user_id": user.user_id, "job_id": job_id})
-    if existing:
-        raise HTTPException(status_code=400, detail="Already applied to this job")
-    
-    body = await request.json() if request.headers.get("content-type") == "application/json" else {}
     
+    now = datetime.now(timezone.utc)
     application = JobApplication(
         user_id=user.user_id,
         job_id=job_id,
-        notes=body.get("notes")
+        notes=body.notes if body else None,
+        applied_at=now,
+        updated_at=now
     )
     doc = application.model_dump()
-    doc["applied_at"] = doc["applied_at"].isoformat()
-    doc["updated_at"] = doc["updated_at"].isoformat()
-    await db.applications.insert_one(doc)
+    
+    # The unique (user_id, job_id) index rejects duplicates atomically
+    try:
+        await db.applications.insert_one(doc)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Already applied to this job")
     
     return {"message": "Application submitted", "application_id": application.application_id}
 
 @api_router.put("/applications/{application_id}")
-async def update_application(application_id: str, request: Request):
+async def update_application(application_id: str, request: Request, user: User = Depends(require_auth)):
     """Update application status"""
-    user = await require_auth(request)
     body = await request.json()
     
     result = await db.applications.update_one(
@@ -599,7 +901,7 @@ async def update_application(application_id: str, request: Request):
         {"$set": {
             "status": body.get("status"),
             "notes": body.get("notes"),
-            "updated_at": datetime.now(timezone.utc).isoformat()
+            "updated_at": datetime.now(timezone.utc)
         }}
     )
     
@@ -610,177 +912,41 @@ async def update_application(application_id: str, request: Request):
 
 # ================== SEED DATA ==================
 
+def seed_job_doc(job_data: dict, posted_date: str) -> dict:
+    """Build the stored document for one seed job, posted at the given ISO timestamp"""
+    doc = H1BJob(**job_data).model_dump()
+    doc["posted_date"] = posted_date
+    return doc
+
 @api_router.post("/seed")
 async def seed_data():
     """Seed initial data"""
+    # Seed records live in seed.json so they are only read when this endpoint runs
+    data = orjson.loads((ROOT_DIR / "seed.json").read_bytes())
+    
     # Clear existing data
-    await db.jobs.delete_many({})
-    await db.companies.delete_many({})
+    await asyncio.gather(db.jobs.delete_many({}), db.companies.delete_many({}))
     
     # Create companies
-    companies = [
-        Company(
-            company_id="comp_google",
-            name="Google",
-            logo_url="https://logo.clearbit.com/google.com",
-            industry="Technology",
-            size="10,000+",
-            location="Mountain View, CA",
-            description="A multinational technology company specializing in Internet-related services and products.",
-            h1b_approvals=8500,
-            h1b_denials=120,
-            avg_salary=185000,
-            founded_year=1998,
-            website="https://google.com"
-        ),
-        Company(
-            company_id="comp_meta",
-            name="Meta",
-            logo_url="https://logo.clearbit.com/meta.com",
-            industry="Technology",
-            size="10,000+",
-            location="Menlo Park, CA",
-            description="A technology conglomerate focusing on social networking and virtual reality.",
-            h1b_approvals=5200,
-            h1b_denials=85,
-            avg_salary=178000,
-            founded_year=2004,
-            website="https://meta.com"
-        ),
-        Company(
-            company_id="comp_amazon",
-            name="Amazon",
-            logo_url="https://logo.clearbit.com/amazon.com",
-            industry="E-Commerce/Technology",
-            size="10,000+",
-            location="Seattle, WA",
-            description="The world's largest online marketplace and cloud computing platform.",
-            h1b_approvals=12000,
-            h1b_denials=280,
-            avg_salary=165000,
-            founded_year=1994,
-            website="https://amazon.com"
-        ),
-        Company(
-            company_id="comp_microsoft",
-            name="Microsoft",
-            logo_url="https://logo.clearbit.com/microsoft.com",
-            industry="Technology",
-            size="10,000+",
-            location="Redmond, WA",
-            description="A technology corporation that develops, manufactures, licenses, and sells computer software and electronics.",
-            h1b_approvals=9800,
-            h1b_denials=150,
-            avg_salary=175000,
-            founded_year=1975,
-            website="https://microsoft.com"
-        ),
-        Company(
-            company_id="comp_apple",
-            name="Apple",
-            logo_url="https://logo.clearbit.com/apple.com",
-            industry="Technology",
-            size="10,000+",
-            location="Cupertino, CA",
-            description="A technology company that designs, develops, and sells consumer electronics, software, and online services.",
-            h1b_approvals=4500,
-            h1b_denials=60,
-            avg_salary=190000,
-            founded_year=1976,
-            website="https://apple.com"
-        ),
-        Company(
-            company_id="comp_netflix",
-            name="Netflix",
-            logo_url="https://logo.clearbit.com/netflix.com",
-            industry="Entertainment/Technology",
-            size="5,000-10,000",
-            location="Los Gatos, CA",
-            description="A streaming entertainment service with millions of paid memberships globally.",
-            h1b_approvals=850,
-            h1b_denials=25,
-            avg_salary=220000,
-            founded_year=1997,
-            website="https://netflix.com"
-        ),
-        Company(
-            company_id="comp_salesforce",
-            name="Salesforce",
-            logo_url="https://logo.clearbit.com/salesforce.com",
-            industry="Cloud Computing",
-            size="10,000+",
-            location="San Francisco, CA",
-            description="A cloud-based software company providing customer relationship management services.",
-            h1b_approvals=3200,
-            h1b_denials=55,
-            avg_salary=168000,
-            founded_year=1999,
-            website="https://salesforce.com"
-        ),
-        Company(
-            company_id="comp_uber",
-            name="Uber",
-            logo_url="https://logo.clearbit.com/uber.com",
-            industry="Transportation/Technology",
-            size="10,000+",
-            location="San Francisco, CA",
-            description="A technology company offering ride-hailing, food delivery, and freight transport services.",
-            h1b_approvals=1800,
-            h1b_denials=40,
-            avg_salary=172000,
-            founded_year=2009,
-            website="https://uber.com"
-        ),
-    ]
-    
-    for company in companies:
-        doc = company.model_dump()
-        await db.companies.insert_one(doc)
+    companies = [Company(**company_data) for company_data in data["companies"]]
+    company_docs = [company.model_dump() for company in companies]
     
     # Create jobs
-    jobs_data = [
-        # Google Jobs
-        {"job_title": "Senior Software Engineer", "company_name": "Google", "company_id": "comp_google", "location": "Mountain View, CA", "state": "CA", "wage_level": 4, "base_salary": 210000, "prevailing_wage": 145000, "job_description": "Design and implement large-scale distributed systems. Lead technical projects and mentor junior engineers.", "requirements": ["8+ years experience", "Python/Java/Go", "Distributed systems", "Machine learning"], "benefits": ["Health insurance", "401k matching", "Stock options", "Unlimited PTO"], "lca_case_number": "I-200-24001-123456"},
-        {"job_title": "Software Engineer III", "company_name": "Google", "company_id": "comp_google", "location": "New York, NY", "state": "NY", "wage_level": 3, "base_salary": 185000, "prevailing_wage": 130000, "job_description": "Build and maintain core infrastructure services. Collaborate with cross-functional teams.", "requirements": ["5+ years experience", "C++/Python", "Cloud platforms", "API design"], "benefits": ["Health insurance", "401k matching", "Stock options", "Gym membership"], "lca_case_number": "I-200-24001-234567"},
-        {"job_title": "Data Scientist", "company_name": "Google", "company_id": "comp_google", "location": "Seattle, WA", "state": "WA", "wage_level": 3, "base_salary": 178000, "prevailing_wage": 125000, "job_description": "Analyze large datasets to drive product decisions. Build ML models for search ranking.", "requirements": ["MS in CS/Statistics", "Python/R", "TensorFlow/PyTorch", "SQL"], "benefits": ["Health insurance", "401k matching", "Stock options"], "lca_case_number": "I-200-24001-345678"},
-        
-        # Meta Jobs
-        {"job_title": "Machine Learning Engineer", "company_name": "Meta", "company_id": "comp_meta", "location": "Menlo Park, CA", "state": "CA", "wage_level": 4, "base_salary": 225000, "prevailing_wage": 150000, "job_description": "Develop and deploy ML models for content recommendation and ad targeting systems.", "requirements": ["7+ years ML experience", "PyTorch", "Distributed training", "PhD preferred"], "benefits": ["Health insurance", "RSUs", "Free meals", "Childcare"], "lca_case_number": "I-200-24002-123456"},
-        {"job_title": "Frontend Engineer", "company_name": "Meta", "company_id": "comp_meta", "location": "Austin, TX", "state": "TX", "wage_level": 2, "base_salary": 145000, "prevailing_wage": 105000, "job_description": "Build user interfaces for Facebook and Instagram. Optimize performance for billions of users.", "requirements": ["3+ years React", "TypeScript", "Performance optimization", "A11y"], "benefits": ["Health insurance", "RSUs", "Remote work"], "lca_case_number": "I-200-24002-234567"},
-        {"job_title": "Product Manager", "company_name": "Meta", "company_id": "comp_meta", "location": "New York, NY", "state": "NY", "wage_level": 3, "base_salary": 195000, "prevailing_wage": 140000, "job_description": "Lead product strategy for WhatsApp Business features. Drive roadmap and execution.", "requirements": ["5+ years PM experience", "B2B products", "Data-driven", "MBA preferred"], "benefits": ["Health insurance", "RSUs", "Stock options"], "lca_case_number": "I-200-24002-345678"},
-        
-        # Amazon Jobs
-        {"job_title": "Software Development Engineer II", "company_name": "Amazon", "company_id": "comp_amazon", "location": "Seattle, WA", "state": "WA", "wage_level": 2, "base_salary": 155000, "prevailing_wage": 110000, "job_description": "Build scalable services for AWS. Design and implement new features for cloud computing platform.", "requirements": ["4+ years experience", "Java/Python", "AWS services", "System design"], "benefits": ["Health insurance", "RSUs", "Signing bonus"], "lca_case_number": "I-200-24003-123456"},
-        {"job_title": "Senior Solutions Architect", "company_name": "Amazon", "company_id": "comp_amazon", "location": "San Francisco, CA", "state": "CA", "wage_level": 4, "base_salary": 205000, "prevailing_wage": 148000, "job_description": "Design cloud architectures for enterprise clients. Lead technical discussions and POCs.", "requirements": ["10+ years experience", "AWS certified", "Enterprise sales", "Public speaking"], "benefits": ["Health insurance", "RSUs", "Travel perks"], "lca_case_number": "I-200-24003-234567"},
-        {"job_title": "Data Engineer", "company_name": "Amazon", "company_id": "comp_amazon", "location": "Arlington, VA", "state": "VA", "wage_level": 2, "base_salary": 148000, "prevailing_wage": 108000, "job_description": "Build data pipelines for business intelligence. Optimize ETL processes at scale.", "requirements": ["3+ years experience", "Spark/Hadoop", "SQL", "Python"], "benefits": ["Health insurance", "RSUs", "Relocation"], "lca_case_number": "I-200-24003-345678"},
-        
-        # Microsoft Jobs
-        {"job_title": "Principal Software Engineer", "company_name": "Microsoft", "company_id": "comp_microsoft", "location": "Redmond, WA", "state": "WA", "wage_level": 4, "base_salary": 235000, "prevailing_wage": 155000, "job_description": "Lead architecture for Azure AI services. Drive technical vision and roadmap.", "requirements": ["12+ years experience", "C#/.NET", "Cloud architecture", "AI/ML"], "benefits": ["Health insurance", "401k", "Stock options", "Sabbatical"], "lca_case_number": "I-200-24004-123456"},
-        {"job_title": "Software Engineer", "company_name": "Microsoft", "company_id": "comp_microsoft", "location": "Atlanta, GA", "state": "GA", "wage_level": 1, "base_salary": 115000, "prevailing_wage": 85000, "job_description": "Develop features for Microsoft 365. Participate in agile development processes.", "requirements": ["1+ years experience", "C#/TypeScript", "Git", "Agile"], "benefits": ["Health insurance", "401k", "Stock purchase"], "lca_case_number": "I-200-24004-234567"},
-        {"job_title": "Cloud Solutions Engineer", "company_name": "Microsoft", "company_id": "comp_microsoft", "location": "Chicago, IL", "state": "IL", "wage_level": 3, "base_salary": 175000, "prevailing_wage": 125000, "job_description": "Help enterprise customers adopt Azure. Design and implement cloud solutions.", "requirements": ["6+ years experience", "Azure certified", "Networking", "Security"], "benefits": ["Health insurance", "401k", "Remote work"], "lca_case_number": "I-200-24004-345678"},
-        
-        # Apple Jobs
-        {"job_title": "iOS Engineer", "company_name": "Apple", "company_id": "comp_apple", "location": "Cupertino, CA", "state": "CA", "wage_level": 3, "base_salary": 195000, "prevailing_wage": 138000, "job_description": "Develop core iOS features. Work on performance optimization and new capabilities.", "requirements": ["5+ years iOS", "Swift/Objective-C", "UIKit/SwiftUI", "Performance tuning"], "benefits": ["Health insurance", "RSUs", "Product discounts"], "lca_case_number": "I-200-24005-123456"},
-        {"job_title": "Hardware Engineer", "company_name": "Apple", "company_id": "comp_apple", "location": "San Diego, CA", "state": "CA", "wage_level": 4, "base_salary": 215000, "prevailing_wage": 150000, "job_description": "Design custom silicon for Apple devices. Work on chip architecture and verification.", "requirements": ["8+ years experience", "Verilog/VHDL", "ASIC design", "Low power"], "benefits": ["Health insurance", "RSUs", "Relocation"], "lca_case_number": "I-200-24005-234567"},
-        
-        # Netflix Jobs
-        {"job_title": "Senior Backend Engineer", "company_name": "Netflix", "company_id": "comp_netflix", "location": "Los Gatos, CA", "state": "CA", "wage_level": 4, "base_salary": 280000, "prevailing_wage": 165000, "job_description": "Build streaming infrastructure serving millions of users. Optimize video delivery systems.", "requirements": ["8+ years experience", "Java/Python", "Microservices", "High scale systems"], "benefits": ["Unlimited PTO", "Top-of-market pay", "Stock options"], "lca_case_number": "I-200-24006-123456"},
-        {"job_title": "Data Platform Engineer", "company_name": "Netflix", "company_id": "comp_netflix", "location": "Los Gatos, CA", "state": "CA", "wage_level": 3, "base_salary": 235000, "prevailing_wage": 145000, "job_description": "Build real-time data pipelines. Support analytics for content and business teams.", "requirements": ["5+ years experience", "Spark/Flink", "Kafka", "Python"], "benefits": ["Unlimited PTO", "Top-of-market pay"], "lca_case_number": "I-200-24006-234567"},
-        
-        # Salesforce Jobs
-        {"job_title": "Full Stack Engineer", "company_name": "Salesforce", "company_id": "comp_salesforce", "location": "San Francisco, CA", "state": "CA", "wage_level": 2, "base_salary": 158000, "prevailing_wage": 115000, "job_description": "Build features for Salesforce platform. Develop both frontend and backend components.", "requirements": ["4+ years experience", "React/Node.js", "REST APIs", "SQL"], "benefits": ["Health insurance", "401k", "Volunteer time"], "lca_case_number": "I-200-24007-123456"},
-        {"job_title": "DevOps Engineer", "company_name": "Salesforce", "company_id": "comp_salesforce", "location": "Indianapolis, IN", "state": "IN", "wage_level": 2, "base_salary": 142000, "prevailing_wage": 102000, "job_description": "Manage CI/CD pipelines. Automate infrastructure deployment and monitoring.", "requirements": ["3+ years experience", "Kubernetes", "Terraform", "AWS/GCP"], "benefits": ["Health insurance", "401k", "Remote work"], "lca_case_number": "I-200-24007-234567"},
-        
-        # Uber Jobs
-        {"job_title": "Staff Software Engineer", "company_name": "Uber", "company_id": "comp_uber", "location": "San Francisco, CA", "state": "CA", "wage_level": 4, "base_salary": 245000, "prevailing_wage": 160000, "job_description": "Lead technical initiatives for rider experience. Architect systems for global scale.", "requirements": ["10+ years experience", "Go/Java", "Distributed systems", "Technical leadership"], "benefits": ["Uber credits", "RSUs", "Health insurance"], "lca_case_number": "I-200-24008-123456"},
-        {"job_title": "Mobile Engineer - Android", "company_name": "Uber", "company_id": "comp_uber", "location": "New York, NY", "state": "NY", "wage_level": 2, "base_salary": 162000, "prevailing_wage": 118000, "job_description": "Build features for Uber driver and rider apps. Optimize battery and network usage.", "requirements": ["3+ years Android", "Kotlin", "RxJava", "Clean architecture"], "benefits": ["Uber credits", "RSUs", "Gym membership"], "lca_case_number": "I-200-24008-234567"},
-    ]
-    
-    for job_data in jobs_data:
-        job = H1BJob(**job_data)
-        doc = job.model_dump()
-        doc["posted_date"] = doc["posted_date"].isoformat()
-        await db.jobs.insert_one(doc)
+    jobs_data = data["jobs"]
+    posted_date = datetime.now(timezone.utc).isoformat()
+    job_docs = [seed_job_doc(job_data, posted_date) for job_data in jobs_data]
+    
+    # One round trip per collection, both in flight at once. Companies have fixed ids, so they
+    # are upserted by company_id and overlapping seed runs can't leave duplicates behind
+    await asyncio.gather(
+        db.companies.bulk_write(
+            [ReplaceOne({"company_id": doc["company_id"]}, doc, upsert=True) for doc in company_docs],
+            ordered=False
+        ),
+        db.jobs.insert_many(job_docs, ordered=False)
+    )
+    stats_cache.clear()
+    company_cache.clear()
     
     return {"message": f"Seeded {len(companies)} companies and {len(jobs_data)} jobs"}
 
@@ -815,7 +981,6 @@ async def trigger_sync():
         raise HTTPException(status_code=503, detail="Job aggregator not initialized")
     
     # Run sync in background
-    import asyncio
     asyncio.create_task(job_aggregator.sync_jobs())
     
     return {"message": "Job sync triggered", "status": "running"}
@@ -835,12 +1000,24 @@ app.add_middleware(
 @app.on_event("startup")
 async def startup_event():
     """Initialize and start job aggregator on startup"""
-    global job_aggregator, job_scheduler
+    global job_aggregator, job_scheduler, auth_http_client
     
     logger.info("Starting H1B Job Board API...")
+    
+    auth_http_client = httpx.AsyncClient(
+        timeout=httpx.Timeout(10.0, connect=5.0),
+        limits=httpx.Limits(max_keepalive_connections=20)
+    )
     logger.info("Initializing job aggregator and scheduler...")
     
+    # Index builds and the OFLC CSV parse (in a worker thread) overlap instead of
+    # leaving the first wage prediction to pay for the parse
     job_aggregator = JobAggregator(db)
+    await asyncio.gather(
+        ensure_indexes(),
+        job_aggregator.ensure_indexes(),
+        ensure_wage_data()
+    )
     job_scheduler = JobScheduler(job_aggregator)
     
     # Start the scheduler
@@ -851,7 +1028,7 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_db_client():
     """Cleanup on shutdown"""
-    global job_aggregator, job_scheduler
+    global job_aggregator, job_scheduler, auth_http_client
     
     logger.info("Shutting down...")
     
@@ -861,5 +1038,8 @@ async def shutdown_db_client():
     if job_aggregator:
         await job_aggregator.close()
     
+    if auth_http_client:
+        await auth_http_client.aclose()
+    
     client.close()
     logger.info("Shutdown complete")
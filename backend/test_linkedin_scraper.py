@@ -5,6 +5,7 @@ Run this to scrape LinkedIn jobs and display results
 """
 import asyncio
 import sys
+import orjson
 sys.path.append('/app/backend')
 
 from linkedin_scraper import linkedin_scraper
@@ -45,9 +46,8 @@ async def main():
                 print()
             
             # Save to file
-            import json
-            with open('/app/backend/linkedin_jobs.json', 'w') as f:
-                json.dump(jobs, f, indent=2)
+            with open('/app/backend/linkedin_jobs.json', 'wb') as f:
+                f.write(orjson.dumps(jobs, option=orjson.OPT_INDENT_2))
             print(f"✅ Jobs saved to: /app/backend/linkedin_jobs.json")
             
         else:
@@ -0,0 +1,36 @@
+"""
+URL Utilities
+Cheap link resolution and size-capped page downloads for scrapers that visit
+thousands of pages per run
+"""
+from typing import Optional
+from urllib.parse import urljoin, urlsplit
+import httpx
+
+def url_origin(url: str) -> str:
+    """Get the scheme and host of a URL, e.g. https://example.com"""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+def fast_urljoin(base: str, origin: str, href: str) -> str:
+    """Resolve href against base, using string checks for the common cases and urljoin otherwise"""
+    if href.startswith(('http://', 'https://')):
+        return href
+    if href.startswith('//'):
+        return 'https:' + href
+    if href.startswith('/'):
+        return origin + href
+    return urljoin(base, href)
+
+async def fetch_capped_text(client: httpx.AsyncClient, url: str, max_bytes: int) -> Optional[str]:
+    """GET a page and decode at most max_bytes of it, or return None if it isn't a 200"""
+    async with client.stream('GET', url) as response:
+        if response.status_code != 200:
+            return None
+        
+        body = bytearray()
+        async for chunk in response.aiter_bytes():
+            body += chunk
+            if len(body) >= max_bytes:
+                break
+        return body[:max_bytes].decode(response.encoding or 'utf-8', errors='ignore')
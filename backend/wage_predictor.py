@@ -5,27 +5,114 @@ Uses OFLC wage data and LLM to predict appropriate wage levels for jobs
 import os
 import csv
 import logging
+import math
+import pickle
 import re
+from collections import Counter, defaultdict
+from functools import lru_cache
 from typing import Dict, Optional, List, Tuple
-from difflib import get_close_matches
+from difflib import SequenceMatcher, get_close_matches
+import numpy as np
+
+# rapidfuzz scores titles in C++; difflib is the pure-Python fallback
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:
+    process = None
 
 logger = logging.getLogger(__name__)
 
+# Parsed OFLC tables are pickled next to the CSVs and reused until a CSV changes
+CACHE_FILE_NAME = "_oflc_cache.pkl"
+SOURCE_FILE_NAMES = ["oes_soc_occs.csv", "Geography.csv", "ALC_Export.csv"]
+
+# Title words longer than 3 characters link a job title to SOC titles, minus filler words
+TITLE_TOKEN_RE = re.compile(r"[a-z]+")
+TITLE_STOPWORDS = frozenset({"other", "with", "except", "including", "related", "occupations", "workers"})
+# Seniority words in job titles, which say nothing about the occupation
+TITLE_LEVEL_WORDS = frozenset({"senior", "junior", "staff", "principal", "lead", "entry", "level", "intern"})
+
+# Title keywords (matched anywhere in the lowercase title) for estimating a level without a salary
+SENIOR_TITLE_RE = re.compile(r"senior|sr|staff|principal|lead|architect")
+JUNIOR_TITLE_RE = re.compile(r"junior|jr|entry|associate|intern")
+MANAGER_TITLE_RE = re.compile(r"manager|director|vp|head of")
+
+# State values that are predicted as California
+INVALID_STATES = frozenset({"Various", "ID", "OR", "NE"})
+
+# Salaries at which the general tech estimate moves up to levels 2, 3 and 4
+FALLBACK_LEVEL_THRESHOLDS = (90000, 130000, 170000)
+
+# Fuzzy title scores (0-100): a near-exact match is taken before the word-overlap vote,
+# a looser one only when the vote finds nothing
+FUZZY_EXACT_SCORE = 90
+FUZZY_MIN_SCORE = 60
+
+# Title words found in more SOC titles than this (engineer, manager, teacher...) are too
+# generic to pick a SOC on their own in the word-overlap vote
+GENERIC_WORD_SOCS = 12
+
+# Distinct job titles whose SOC lookup result is remembered
+SOC_LOOKUP_CACHE_SIZE = 4096
+
+# Common tech job mappings, checked before fuzzy and partial SOC title matches
+TECH_SOC_MAPPINGS = {
+    'software engineer': '15-1252',
+    'software developer': '15-1252',
+    'web developer': '15-1254',
+    'data scientist': '15-2051',
+    'data analyst': '15-2051',
+    'database administrator': '15-1242',
+    'network engineer': '15-1244',
+    'systems administrator': '15-1244',
+    'devops': '15-1244',
+    'product manager': '11-2021',
+    'project manager': '11-9199',
+}
+
+def singular(word: str) -> str:
+    """Fold a plural word to singular, e.g. developers -> developer"""
+    return word[:-1] if word.endswith('s') and len(word) > 4 else word
+
+def folded_title(title_lower: str) -> str:
+    """Get a lowercase title with every word folded to singular, for plural-insensitive exact matches"""
+    return " ".join(singular(word) for word in TITLE_TOKEN_RE.findall(title_lower))
+
+def title_tokens(title_lower: str) -> List[str]:
+    """Get the distinct matching words of a lowercase title, plurals folded to singular"""
+    return list(dict.fromkeys(
+        singular(token)
+        for token in TITLE_TOKEN_RE.findall(title_lower)
+        if len(token) > 3 and token not in TITLE_STOPWORDS
+    ))
+
 class WageLevelPredictor:
     """Predicts wage levels using OFLC data and AI"""
     
     def __init__(self):
-        self.wage_data = {}  # {state_abbr: {soc_code: {level1, level2, level3, level4}}}
+        self.soc_index = {}  # {(state_abbr, soc_code): row in wage_levels}
+        self.wage_levels = np.empty((0, 4))  # annual level1-4 wages, one row per (state, SOC)
         self.soc_titles = {}  # {soc_code: title}
         self.soc_descriptions = {}  # {soc_code: description}
         self.geography = {}  # {area_code: {name, state_abbr}}
+        self.title_to_soc = {}  # {title: soc_code}, first SOC wins
+        self.title_list = []  # distinct SOC titles, in file order
+        self.title_lower_to_soc = {}  # {lowercase title: soc_code}
+        self.title_folded_to_soc = {}  # {lowercase title, words singular: soc_code}
+        self.soc_order = {}  # {soc_code: position in the SOC file}
+        self.token_index = defaultdict(set)  # {title word: {soc_code}}
         self.loaded = False
+        self.cached_soc_lookup = lru_cache(maxsize=SOC_LOOKUP_CACHE_SIZE)(self.lookup_soc_code)
         
     def load_data(self, data_dir: str = "/app/backend/OFLC_Wages_2025-26_Updated"):
         """Load OFLC wage data"""
         if self.loaded:
             return
             
+        cache_file = os.path.join(data_dir, CACHE_FILE_NAME)
+        if self.load_cache(cache_file, data_dir):
+            return
+            
         try:
             logger.info("Loading OFLC wage data...")
             
@@ -44,14 +131,20 @@ class WageLevelPredictor:
             # Load geography data
             geo_file = os.path.join(data_dir, "Geography.csv")
             if os.path.exists(geo_file):
-                with open(geo_file, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
+                with open(geo_file, 'r', encoding='utf-8', newline='') as f:
+                    # Positional rows with column indexes read from the header, no dict per row
+                    reader = csv.reader(f)
+                    header = next(reader, [])
+                    area_col, name_col, state_col = (header.index(column) for column in ('Area', 'AreaName', 'StateAb'))
+                    row_width = max(area_col, name_col, state_col) + 1
                     for row in reader:
-                        area = row.get('Area', '').strip()
-                        state_ab = row.get('StateAb', '').strip()
+                        if len(row) < row_width:
+                            continue
+                        area = row[area_col].strip()
+                        state_ab = row[state_col].strip()
                         if area and state_ab:
                             self.geography[area] = {
-                                'name': row.get('AreaName', '').strip(),
+                                'name': row[name_col].strip(),
                                 'state_abbr': state_ab
                             }
                 logger.info(f"Loaded {len(self.geography)} geographic areas")
@@ -59,96 +152,162 @@ class WageLevelPredictor:
             # Load wage data (ALC_Export.csv - most comprehensive)
             wage_file = os.path.join(data_dir, "ALC_Export.csv")
             if os.path.exists(wage_file):
-                with open(wage_file, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        area = row.get('Area', '').strip()
-                        soc_code = row.get('SocCode', '').strip()
-                        
-                        # Get state from geography
-                        geo_info = self.geography.get(area, {})
-                        state_abbr = geo_info.get('state_abbr', 'US')
-                        
-                        if not state_abbr or not soc_code:
-                            continue
-                        
-                        # Parse wage levels (hourly)
-                        try:
-                            level1 = float(row.get('Level1', 0))
-                            level2 = float(row.get('Level2', 0))
-                            level3 = float(row.get('Level3', 0))
-                            level4 = float(row.get('Level4', 0))
-                            
-                            # Store by state and SOC code
-                            if state_abbr not in self.wage_data:
-                                self.wage_data[state_abbr] = {}
-                            
-                            if soc_code not in self.wage_data[state_abbr]:
-                                self.wage_data[state_abbr][soc_code] = {
-                                    'level1': level1 * 2080,  # Convert to annual
-                                    'level2': level2 * 2080,
-                                    'level3': level3 * 2080,
-                                    'level4': level4 * 2080
-                                }
-                        except (ValueError, TypeError):
-                            continue
+                # Parsed column-wise in C; pandas is only imported when the CSVs are read
+                import pandas as pd
                 
-                logger.info(f"Loaded wage data for {len(self.wage_data)} states")
+                df = pd.read_csv(
+                    wage_file,
+                    usecols=['Area', 'SocCode', 'Level1', 'Level2', 'Level3', 'Level4'],
+                    dtype={'Area': str, 'SocCode': str},
+                    low_memory=False
+                )
+                df['Area'] = df['Area'].fillna('').str.strip()
+                df['SocCode'] = df['SocCode'].fillna('').str.strip()
+                
+                # Get state from geography, falling back to national rows
+                area_to_state = {area: geo['state_abbr'] for area, geo in self.geography.items()}
+                df['state_abbr'] = df['Area'].map(area_to_state).fillna('US')
+                
+                # Parse wage levels (hourly) and convert to annual; unparseable rows are skipped
+                level_columns = ['Level1', 'Level2', 'Level3', 'Level4']
+                df[level_columns] = df[level_columns].apply(pd.to_numeric, errors='coerce') * 2080
+                df = df[df['SocCode'] != ''].dropna(subset=level_columns)
+                
+                # Store by state and SOC code, keeping the first row for each pair
+                df = df.drop_duplicates(subset=['state_abbr', 'SocCode'], keep='first')
+                self.soc_index = {key: row for row, key in enumerate(zip(df['state_abbr'], df['SocCode']))}
+                self.wage_levels = df[level_columns].to_numpy(dtype=np.float64)
+                
+                logger.info(f"Loaded wage data for {df['state_abbr'].nunique()} states")
             
+            # Readers check loaded without a lock, so it flips only once the indexes are complete
+            self.build_title_index()
             self.loaded = True
             logger.info("OFLC wage data loaded successfully!")
+            self.save_cache(cache_file)
             
         except Exception as e:
             logger.error(f"Error loading OFLC data: {e}")
             self.loaded = False
     
+    def load_cache(self, cache_file: str, data_dir: str) -> bool:
+        """Load parsed tables from the pickle cache if it is newer than every source CSV"""
+        try:
+            cache_mtime = os.path.getmtime(cache_file)
+            source_files = [os.path.join(data_dir, name) for name in SOURCE_FILE_NAMES]
+            if any(os.path.exists(path) and os.path.getmtime(path) > cache_mtime for path in source_files):
+                return False
+            with open(cache_file, 'rb') as f:
+                (self.soc_index, self.wage_levels, self.soc_titles,
+                 self.soc_descriptions, self.geography) = pickle.load(f)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable OFLC cache: {e}")
+            return False
+        
+        self.build_title_index()
+        self.loaded = True
+        logger.info(f"Loaded OFLC wage data for {len(self.soc_index)} state/SOC pairs from cache")
+        return True
+    
+    def save_cache(self, cache_file: str):
+        """Pickle the parsed tables (wages already annualized) for the next start"""
+        try:
+            with open(cache_file, 'wb') as f:
+                pickle.dump(
+                    (self.soc_index, self.wage_levels, self.soc_titles,
+                     self.soc_descriptions, self.geography),
+                    f, protocol=pickle.HIGHEST_PROTOCOL
+                )
+        except OSError as e:
+            logger.warning(f"Could not write OFLC cache: {e}")
+    
+    def build_title_index(self):
+        """Index SOC titles for exact and word-overlap lookups"""
+        self.title_to_soc = {}
+        self.title_lower_to_soc = {}
+        self.title_folded_to_soc = {}
+        self.soc_order = {}
+        self.token_index = defaultdict(set)
+        for position, (soc_code, title) in enumerate(self.soc_titles.items()):
+            title_lower = title.lower()
+            self.title_to_soc.setdefault(title, soc_code)
+            self.title_lower_to_soc.setdefault(title_lower, soc_code)
+            self.title_folded_to_soc.setdefault(folded_title(title_lower), soc_code)
+            self.soc_order[soc_code] = position
+            for token in title_tokens(title_lower):
+                self.token_index[token].add(soc_code)
+        self.title_list = list(self.title_to_soc)
+        self.cached_soc_lookup.cache_clear()
+    
     def find_soc_code_by_title(self, job_title: str) -> Optional[str]:
         """Find SOC code by job title using fuzzy matching"""
         if not job_title or not self.soc_titles:
             return None
-        
+        return self.cached_soc_lookup(job_title)
+    
+    def lookup_soc_code(self, job_title: str) -> Optional[str]:
+        """Match a job title against the indexed SOC titles"""
         job_title_lower = job_title.lower()
         
-        # First try exact match
-        for soc_code, title in self.soc_titles.items():
-            if title.lower() == job_title_lower:
-                return soc_code
+        # First try exact match, then the same ignoring plurals ("Web Developer" -> "Web Developers")
+        soc_code = self.title_lower_to_soc.get(job_title_lower) or self.title_folded_to_soc.get(folded_title(job_title_lower))
+        if soc_code:
+            return soc_code
         
-        # Try partial matches
-        for soc_code, title in self.soc_titles.items():
-            title_lower = title.lower()
-            # Check if key terms match
-            if any(word in title_lower for word in job_title_lower.split() if len(word) > 3):
-                if any(word in job_title_lower for word in title_lower.split() if len(word) > 3):
-                    return soc_code
+        # Then common tech titles whose words would otherwise match an unrelated SOC
+        # ("Product Manager" -> Farm Products)
+        for key, soc in TECH_SOC_MAPPINGS.items():
+            if key in job_title_lower:
+                return soc
         
-        # Use fuzzy matching as last resort
-        soc_titles_list = list(self.soc_titles.values())
-        matches = get_close_matches(job_title, soc_titles_list, n=1, cutoff=0.6)
-        if matches:
-            # Find SOC code for the match
-            for soc_code, title in self.soc_titles.items():
-                if title == matches[0]:
-                    return soc_code
+        # Then fuzzy matching against whole titles; only a near-exact score wins outright
+        fuzzy_soc = None
+        if process is not None:
+            match = process.extractOne(job_title, self.title_list, scorer=fuzz.ratio, score_cutoff=FUZZY_MIN_SCORE)
+            if match:
+                fuzzy_soc = self.title_to_soc[match[0]]
+                if match[1] >= FUZZY_EXACT_SCORE:
+                    return fuzzy_soc
+        else:
+            matches = get_close_matches(job_title, self.title_list, n=1, cutoff=FUZZY_MIN_SCORE / 100)
+            if matches:
+                fuzzy_soc = self.title_to_soc[matches[0]]
+                if SequenceMatcher(None, job_title, matches[0]).ratio() * 100 >= FUZZY_EXACT_SCORE:
+                    return fuzzy_soc
         
-        # Common tech job mappings
-        tech_mappings = {
-            'software engineer': '15-1252',
-            'software developer': '15-1252',
-            'web developer': '15-1254',
-            'data scientist': '15-2051',
-            'data analyst': '15-2051',
-            'database administrator': '15-1242',
-            'network engineer': '15-1244',
-            'systems administrator': '15-1244',
-            'devops': '15-1244',
-            'product manager': '11-2021',
-            'project manager': '11-9199',
-        }
+        # Try partial matches: each title word found in SOC titles counts by how rare it is among
+        # them. The winning SOC must share a specific, non-generic word and cover most of the job
+        # title's weight, so "engineer" alone can't pick an unrelated SOC. Ties go to the SOC
+        # earliest in the file.
+        overlap = Counter()
+        specific_socs = set()
+        total_weight = 0.0
+        soc_count = len(self.soc_titles)
+        for token in title_tokens(job_title_lower):
+            if token in TITLE_LEVEL_WORDS:
+                continue
+            socs = self.token_index.get(token)
+            if not socs:
+                continue
+            weight = math.log((soc_count + 1) / (len(socs) + 1))
+            total_weight += weight
+            if len(socs) <= GENERIC_WORD_SOCS:
+                specific_socs.update(socs)
+            for soc in socs:
+                overlap[soc] += weight
+        if specific_socs:
+            best = max(overlap[soc] for soc in specific_socs)
+            if best * 2 > total_weight:
+                return min(
+                    (soc for soc in specific_socs if overlap[soc] == best),
+                    key=self.soc_order.__getitem__
+                )
         
-        for key, soc in tech_mappings.items():
-            if key in job_title_lower:
-                return soc
+        # Use a looser fuzzy match as last resort
+        if fuzzy_soc:
+            return fuzzy_soc
         
         return None
     
@@ -164,15 +323,15 @@ class WageLevelPredictor:
             return None
         
         # Get wage data for state
-        state_wages = self.wage_data.get(state, self.wage_data.get('US', {}))
-        if soc_code not in state_wages:
+        row = self.soc_index.get((state, soc_code))
+        if row is None:
             # Try national average if state-specific not available
-            state_wages = self.wage_data.get('US', {})
-        
-        if soc_code in state_wages:
-            return state_wages[soc_code]
+            row = self.soc_index.get(('US', soc_code))
+        if row is None:
+            return None
         
-        return None
+        level1, level2, level3, level4 = self.wage_levels[row].tolist()
+        return {'level1': level1, 'level2': level2, 'level3': level3, 'level4': level4}
     
     def predict_wage_level(self, job_title: str, state: str, salary: float) -> int:
         """
@@ -183,56 +342,43 @@ class WageLevelPredictor:
             2: Default if unable to determine
         """
         # Handle invalid states
-        if not state or state == "Remote" or len(state) > 2 or state in ["Various", "ID", "OR", "NE"]:
+        if not state or state == "Remote" or len(state) > 2 or state in INVALID_STATES:
             state = "CA"  # Default to California for remote/invalid
         
-        # Get OFLC wage levels for this job/location
-        wage_levels = self.get_wage_levels_for_job(job_title, state)
-        
         # If no salary provided, use job title patterns to estimate level
         if not salary or salary <= 0:
             title_lower = job_title.lower()
             
             # Senior/Staff/Principal = Level 3-4
-            if any(word in title_lower for word in ['senior', 'sr', 'staff', 'principal', 'lead', 'architect']):
+            if SENIOR_TITLE_RE.search(title_lower):
                 return 3
             # Junior/Entry/Associate = Level 1
-            elif any(word in title_lower for word in ['junior', 'jr', 'entry', 'associate', 'intern']):
+            elif JUNIOR_TITLE_RE.search(title_lower):
                 return 1
             # Manager/Director = Level 4
-            elif any(word in title_lower for word in ['manager', 'director', 'vp', 'head of']):
+            elif MANAGER_TITLE_RE.search(title_lower):
                 return 4
             # Default mid-level = Level 2
             else:
                 return 2
         
+        # Get OFLC wage levels for this job/location (not needed for the title-only estimate above)
+        wage_levels = self.get_wage_levels_for_job(job_title, state)
+        
         if not wage_levels:
             # Fallback: use general tech salary ranges
-            if salary < 90000:
-                return 1
-            elif salary < 130000:
-                return 2
-            elif salary < 170000:
-                return 3
-            else:
-                return 4
-        
-        # Compare salary to OFLC levels
-        level1 = wage_levels.get('level1', 0)
-        level2 = wage_levels.get('level2', 0)
-        level3 = wage_levels.get('level3', 0)
-        level4 = wage_levels.get('level4', 0)
-        
-        # Determine which level the salary falls into
-        # Add 10% buffer for matching
-        if salary < level2 * 0.9:
-            return 1
-        elif salary < level3 * 0.9:
-            return 2
-        elif salary < level4 * 0.9:
-            return 3
+            thresholds = FALLBACK_LEVEL_THRESHOLDS
         else:
-            return 4
+            # Compare salary to OFLC levels 2-4, with a 10% buffer for matching
+            thresholds = (
+                wage_levels.get('level2', 0) * 0.9,
+                wage_levels.get('level3', 0) * 0.9,
+                wage_levels.get('level4', 0) * 0.9
+            )
+        
+        # Each threshold the salary falls short of lowers the level by one; OFLC levels ascend,
+        # so this matches the threshold-by-threshold comparison without branching
+        return 4 - (salary < thresholds[0]) - (salary < thresholds[1]) - (salary < thresholds[2])
     
     def get_suggested_salary_range(self, job_title: str, state: str, level: int = 2) -> Tuple[float, float]:
         """Get suggested salary range for a job/location/level"""
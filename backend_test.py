@@ -1,50 +1,109 @@
-import requests
+import asyncio
+import httpx
+import orjson
 import sys
 from datetime import datetime
 
+BASE_URL = "https://job-fetch-app.preview.emergentagent.com/api"
+
+# Tests in flight at once; suites within a phase run concurrently
+MAX_CONCURRENT_TESTS = 10
+
+# Fail fast on a dead host, but give slow endpoints time to answer
+REQUEST_TIMEOUT = httpx.Timeout(10.0, connect=3.0)
+
+# A request is retried once, after a short pause, on a connection error, read
+# timeout or gateway 5xx so a transient hiccup isn't counted as a failure
+MAX_ATTEMPTS = 2
+RETRY_BACKOFF = 0.3
+RETRY_STATUS_CODES = frozenset({502, 503, 504})
+
+def partition_jobs(jobs):
+    """Split jobs into external, internal and Greenhouse lists in one pass"""
+    external_jobs, internal_jobs, greenhouse_jobs = [], [], []
+    for job in jobs:
+        if job.get('is_external'):
+            external_jobs.append(job)
+            if job.get('source') == 'greenhouse':
+                greenhouse_jobs.append(job)
+        else:
+            internal_jobs.append(job)
+    return external_jobs, internal_jobs, greenhouse_jobs
+
 class H1BJobBoardTester:
-    def __init__(self, base_url="https://job-fetch-app.preview.emergentagent.com/api"):
+    def __init__(self, base_url=BASE_URL):
         self.base_url = base_url
         self.tests_run = 0
         self.tests_passed = 0
         self.failed_tests = []
+        self.client = None
+        self.semaphore = asyncio.Semaphore(MAX_CONCURRENT_TESTS)
+        # In-flight or finished "Get all jobs" test, shared by every suite that reads the list
+        self.jobs_cache = None
 
-    def run_test(self, name, method, endpoint, expected_status, data=None, headers=None):
-        """Run a single API test"""
-        url = f"{self.base_url}/{endpoint}"
-        if headers is None:
-            headers = {'Content-Type': 'application/json'}
+    async def send(self, method, endpoint, data=None, headers=None, stream=False):
+        """Send a request, retrying transient failures up to MAX_ATTEMPTS times.
 
+        With stream=True the body is left unread; the caller must close the response.
+        """
+        request = self.client.build_request(method, endpoint, json=data, headers=headers)
+        for attempt in range(MAX_ATTEMPTS):
+            last_attempt = attempt == MAX_ATTEMPTS - 1
+            try:
+                response = await self.client.send(request, stream=stream)
+            except (httpx.ConnectError, httpx.ReadTimeout):
+                if last_attempt:
+                    raise
+            else:
+                if last_attempt or response.status_code not in RETRY_STATUS_CODES:
+                    return response
+                await response.aclose()
+            await asyncio.sleep(RETRY_BACKOFF * (attempt + 1))
+
+    async def run_test(self, name, method, endpoint, expected_status, data=None, headers=None, parse_json=True):
+        """Run a single API test.
+
+        Status-only tests pass parse_json=False: the body is streamed and closed
+        unread unless the status check fails and it has to be shown.
+        """
         self.tests_run += 1
-        print(f"\n🔍 Testing {name}...")
-        print(f"   URL: {url}")
+        # Each test's lines are printed together so concurrent tests don't interleave
+        lines = [f"\n🔍 Testing {name}...", f"   URL: {self.base_url}/{endpoint}"]
+        log = lines.append
+        response = None
         
         try:
-            if method == 'GET':
-                response = requests.get(url, headers=headers)
-            elif method == 'POST':
-                response = requests.post(url, json=data, headers=headers)
+            async with self.semaphore:
+                response = await self.send(method, endpoint, data, headers, stream=not parse_json)
+
+            # The body is decoded once and reused for logging and the return value
+            response_data = None
+            if parse_json:
+                try:
+                    response_data = orjson.loads(response.content)
+                except orjson.JSONDecodeError:
+                    pass
 
             success = response.status_code == expected_status
             if success:
                 self.tests_passed += 1
-                print(f"✅ Passed - Status: {response.status_code}")
-                try:
-                    response_data = response.json()
-                    if isinstance(response_data, dict):
-                        if 'jobs' in response_data:
-                            print(f"   Found {len(response_data.get('jobs', []))} jobs")
-                        elif 'companies' in response_data:
-                            print(f"   Found {len(response_data.get('companies', []))} companies")
-                        elif 'message' in response_data:
-                            print(f"   Message: {response_data['message']}")
-                    elif isinstance(response_data, list):
-                        print(f"   Found {len(response_data)} items")
-                except:
-                    print(f"   Response length: {len(response.text)} chars")
+                log(f"✅ Passed - Status: {response.status_code}")
+                if isinstance(response_data, dict):
+                    if 'jobs' in response_data:
+                        log(f"   Found {len(response_data.get('jobs', []))} jobs")
+                    elif 'companies' in response_data:
+                        log(f"   Found {len(response_data.get('companies', []))} companies")
+                    elif 'message' in response_data:
+                        log(f"   Message: {response_data['message']}")
+                elif isinstance(response_data, list):
+                    log(f"   Found {len(response_data)} items")
+                elif parse_json:
+                    log(f"   Response length: {len(response.content)} bytes")
             else:
-                print(f"❌ Failed - Expected {expected_status}, got {response.status_code}")
-                print(f"   Response: {response.text[:200]}...")
+                log(f"❌ Failed - Expected {expected_status}, got {response.status_code}")
+                if not parse_json:
+                    await response.aread()
+                log(f"   Response: {response.text[:200]}...")
                 self.failed_tests.append({
                     'name': name,
                     'expected': expected_status,
@@ -52,10 +111,10 @@ class H1BJobBoardTester:
                     'endpoint': endpoint
                 })
 
-            return success, response.json() if success else {}
+            return success, response_data if success and response_data is not None else {}
 
         except Exception as e:
-            print(f"❌ Failed - Error: {str(e)}")
+            log(f"❌ Failed - Error: {str(e)}")
             self.failed_tests.append({
                 'name': name,
                 'error': str(e),
@@ -63,152 +122,197 @@ class H1BJobBoardTester:
             })
             return False, {}
 
-    def test_health_endpoints(self):
+        finally:
+            if response is not None:
+                await response.aclose()
+            print("\n".join(lines))
+
+    def get_jobs(self):
+        """Fetch the jobs list once; concurrent callers await the same request"""
+        if self.jobs_cache is None:
+            self.jobs_cache = asyncio.ensure_future(self.run_test("Get all jobs", "GET", "jobs", 200))
+        return self.jobs_cache
+
+    async def test_health_endpoints(self):
         """Test basic health endpoints"""
         print("\n=== TESTING HEALTH ENDPOINTS ===")
-        self.run_test("Root endpoint", "GET", "", 200)
-        self.run_test("Health check", "GET", "health", 200)
+        await asyncio.gather(
+            self.run_test("Root endpoint", "GET", "", 200, parse_json=False),
+            self.run_test("Health check", "GET", "health", 200, parse_json=False)
+        )
 
-    def test_jobs_endpoints(self):
+    async def test_jobs_endpoints(self):
         """Test job-related endpoints"""
         print("\n=== TESTING JOBS ENDPOINTS ===")
         
-        # Test basic jobs endpoint
-        success, jobs_data = self.run_test("Get all jobs", "GET", "jobs", 200)
-        if success and jobs_data.get('jobs'):
-            job_id = jobs_data['jobs'][0]['job_id']
-            print(f"   Using job_id: {job_id} for detailed test")
-            
-            # Test single job endpoint
-            self.run_test("Get single job", "GET", f"jobs/{job_id}", 200)
-        
-        # Test jobs with filters
-        self.run_test("Jobs with search filter", "GET", "jobs?search=Software", 200)
-        self.run_test("Jobs with state filter", "GET", "jobs?state=CA", 200)
-        self.run_test("Jobs with wage level filter", "GET", "jobs?wage_level=4", 200)
-        self.run_test("Jobs with salary filter", "GET", "jobs?min_salary=150000", 200)
+        async def test_list_and_detail():
+            # Test basic jobs endpoint
+            success, jobs_data = await self.get_jobs()
+            if success and jobs_data.get('jobs'):
+                job_id = jobs_data['jobs'][0]['job_id']
+                print(f"   Using job_id: {job_id} for detailed test")
+                
+                # Test single job endpoint
+                await self.run_test("Get single job", "GET", f"jobs/{job_id}", 200)
         
-        # Test wage level stats
-        self.run_test("Wage level statistics", "GET", "jobs/stats/wage-levels", 200)
-        self.run_test("State statistics", "GET", "jobs/stats/by-state", 200)
+        # The list/detail chain runs alongside the filter and wage level stats tests
+        await asyncio.gather(
+            test_list_and_detail(),
+            self.run_test("Jobs with search filter", "GET", "jobs?search=Software", 200),
+            self.run_test("Jobs with state filter", "GET", "jobs?state=CA", 200),
+            self.run_test("Jobs with wage level filter", "GET", "jobs?wage_level=4", 200),
+            self.run_test("Jobs with salary filter", "GET", "jobs?min_salary=150000", 200),
+            self.run_test("Wage level statistics", "GET", "jobs/stats/wage-levels", 200),
+            self.run_test("State statistics", "GET", "jobs/stats/by-state", 200)
+        )
 
-    def test_companies_endpoints(self):
+    async def test_companies_endpoints(self):
         """Test company-related endpoints"""
         print("\n=== TESTING COMPANIES ENDPOINTS ===")
         
-        # Test basic companies endpoint
-        success, companies_data = self.run_test("Get all companies", "GET", "companies", 200)
-        if success and companies_data.get('companies'):
-            company_id = companies_data['companies'][0]['company_id']
-            print(f"   Using company_id: {company_id} for detailed test")
-            
-            # Test single company endpoint
-            self.run_test("Get single company", "GET", f"companies/{company_id}", 200)
+        async def test_list_and_detail():
+            # Test basic companies endpoint
+            success, companies_data = await self.run_test("Get all companies", "GET", "companies", 200)
+            if success and companies_data.get('companies'):
+                company_id = companies_data['companies'][0]['company_id']
+                print(f"   Using company_id: {company_id} for detailed test")
+                
+                # Test single company endpoint
+                await self.run_test("Get single company", "GET", f"companies/{company_id}", 200)
         
-        # Test companies with search
-        self.run_test("Companies with search", "GET", "companies?search=Google", 200)
+        # Test companies with search alongside the list/detail chain
+        await asyncio.gather(
+            test_list_and_detail(),
+            self.run_test("Companies with search", "GET", "companies?search=Google", 200)
+        )
 
-    def test_seed_endpoint(self):
+    async def test_seed_endpoint(self):
         """Test data seeding"""
         print("\n=== TESTING SEED ENDPOINT ===")
-        self.run_test("Seed data", "POST", "seed", 200)
+        await self.run_test("Seed data", "POST", "seed", 200)
+        self.jobs_cache = None
 
-    def test_auth_endpoints(self):
+    async def test_auth_endpoints(self):
         """Test authentication endpoints (without actual auth)"""
         print("\n=== TESTING AUTH ENDPOINTS ===")
         
         # These should fail without proper auth
-        self.run_test("Get current user (no auth)", "GET", "auth/me", 401)
-        self.run_test("Get saved jobs (no auth)", "GET", "saved-jobs", 401)
-        self.run_test("Get applications (no auth)", "GET", "applications", 401)
+        await asyncio.gather(
+            self.run_test("Get current user (no auth)", "GET", "auth/me", 401, parse_json=False),
+            self.run_test("Get saved jobs (no auth)", "GET", "saved-jobs", 401, parse_json=False),
+            self.run_test("Get applications (no auth)", "GET", "applications", 401, parse_json=False)
+        )
 
-    def test_job_sync_endpoints(self):
+    async def test_job_sync_endpoints(self):
         """Test real-time job aggregation endpoints"""
         print("\n=== TESTING JOB SYNC ENDPOINTS ===")
         
         # Test sync status endpoint
-        success, status_data = self.run_test("Job sync status", "GET", "jobs/sync/status", 200)
+        success, status_data = await self.run_test("Job sync status", "GET", "jobs/sync/status", 200)
         if success:
-            print(f"   Sync status: {status_data.get('status', 'unknown')}")
-            print(f"   Total external jobs: {status_data.get('total_external_jobs', 0)}")
-            print(f"   Greenhouse jobs: {status_data.get('greenhouse_jobs', 0)}")
-            print(f"   Arbeitnow jobs: {status_data.get('arbeitnow_jobs', 0)}")
-            print(f"   Internal jobs: {status_data.get('internal_jobs', 0)}")
-            print(f"   Last synced: {status_data.get('last_synced', 'Never')}")
-            print(f"   Scheduler running: {status_data.get('running', False)}")
+            print("\n".join([
+                f"   Sync status: {status_data.get('status', 'unknown')}",
+                f"   Total external jobs: {status_data.get('total_external_jobs', 0)}",
+                f"   Greenhouse jobs: {status_data.get('greenhouse_jobs', 0)}",
+                f"   Arbeitnow jobs: {status_data.get('arbeitnow_jobs', 0)}",
+                f"   Internal jobs: {status_data.get('internal_jobs', 0)}",
+                f"   Last synced: {status_data.get('last_synced', 'Never')}",
+                f"   Scheduler running: {status_data.get('running', False)}"
+            ]))
         
         # Test manual sync trigger
-        self.run_test("Manual sync trigger", "POST", "jobs/sync/trigger", 200)
+        await self.run_test("Manual sync trigger", "POST", "jobs/sync/trigger", 200, parse_json=False)
+        self.jobs_cache = None
 
-    def test_external_jobs(self):
+    async def test_external_jobs(self):
         """Test external job features"""
         print("\n=== TESTING EXTERNAL JOBS ===")
         
-        # Test jobs endpoint for external jobs
-        success, jobs_data = self.run_test("Get jobs with external data", "GET", "jobs?limit=50", 200)
-        if success and jobs_data.get('jobs'):
-            external_jobs = [job for job in jobs_data['jobs'] if job.get('is_external')]
-            internal_jobs = [job for job in jobs_data['jobs'] if not job.get('is_external')]
+        # The suite's notes are printed together once the detail test has finished
+        lines = []
+        log = lines.append
+        try:
+            # Reuse the jobs list fetched for the jobs endpoint tests
+            success, jobs_data = await self.get_jobs()
+            if success and jobs_data.get('jobs'):
+                external_jobs, internal_jobs, greenhouse_jobs = partition_jobs(jobs_data['jobs'])
             
-            print(f"   Found {len(external_jobs)} external jobs")
-            print(f"   Found {len(internal_jobs)} internal jobs")
+                log(f"   Found {len(external_jobs)} external jobs")
+                log(f"   Found {len(internal_jobs)} internal jobs")
             
-            # Test external job details
-            if external_jobs:
-                external_job = external_jobs[0]
-                job_id = external_job['job_id']
-                print(f"   Testing external job: {job_id}")
-                print(f"   Source: {external_job.get('source', 'unknown')}")
-                print(f"   Company: {external_job.get('company_name', 'unknown')}")
-                print(f"   External URL: {external_job.get('external_url', 'none')}")
+                # Test external job details
+                if external_jobs:
+                    external_job = external_jobs[0]
+                    job_id = external_job['job_id']
+                    log(f"   Testing external job: {job_id}")
+                    log(f"   Source: {external_job.get('source', 'unknown')}")
+                    log(f"   Company: {external_job.get('company_name', 'unknown')}")
+                    log(f"   External URL: {external_job.get('external_url', 'none')}")
                 
-                # Test single external job endpoint
-                success, job_detail = self.run_test("Get external job detail", "GET", f"jobs/{job_id}", 200)
-                if success:
-                    print(f"   ✓ External job detail retrieved successfully")
-                    print(f"   Has external_url: {'external_url' in job_detail}")
-                    print(f"   Has source: {'source' in job_detail}")
-                    print(f"   Is external: {job_detail.get('is_external', False)}")
+                    # Test single external job endpoint
+                    success, job_detail = await self.run_test("Get external job detail", "GET", f"jobs/{job_id}", 200)
+                    if success:
+                        log(f"   ✓ External job detail retrieved successfully")
+                        log(f"   Has external_url: {'external_url' in job_detail}")
+                        log(f"   Has source: {'source' in job_detail}")
+                        log(f"   Is external: {job_detail.get('is_external', False)}")
             
-            # Test Greenhouse jobs specifically
-            greenhouse_jobs = [job for job in external_jobs if job.get('source') == 'greenhouse']
-            if greenhouse_jobs:
-                gh_job = greenhouse_jobs[0]
-                print(f"   Testing Greenhouse job: {gh_job['job_id']}")
-                print(f"   Company: {gh_job.get('company_name', 'unknown')}")
-                print(f"   External URL: {gh_job.get('external_url', 'none')}")
+                # Test Greenhouse jobs specifically
+                if greenhouse_jobs:
+                    gh_job = greenhouse_jobs[0]
+                    log(f"   Testing Greenhouse job: {gh_job['job_id']}")
+                    log(f"   Company: {gh_job.get('company_name', 'unknown')}")
+                    log(f"   External URL: {gh_job.get('external_url', 'none')}")
                 
-                # Verify Greenhouse job ID format
-                if gh_job['job_id'].startswith('gh_'):
-                    print(f"   ✓ Greenhouse job ID format correct")
-                else:
-                    print(f"   ❌ Greenhouse job ID format incorrect: {gh_job['job_id']}")
+                    # Verify Greenhouse job ID format
+                    if gh_job['job_id'].startswith('gh_'):
+                        log(f"   ✓ Greenhouse job ID format correct")
+                    else:
+                        log(f"   ❌ Greenhouse job ID format incorrect: {gh_job['job_id']}")
+        finally:
+            if lines:
+                print("\n".join(lines))
 
-    def test_error_cases(self):
+    async def test_error_cases(self):
         """Test error handling"""
         print("\n=== TESTING ERROR CASES ===")
         
         # Test non-existent job
-        self.run_test("Non-existent job", "GET", "jobs/nonexistent", 404)
-        
-        # Test non-existent company
-        self.run_test("Non-existent company", "GET", "companies/nonexistent", 404)
+        await asyncio.gather(
+            self.run_test("Non-existent job", "GET", "jobs/nonexistent", 404, parse_json=False),
+            self.run_test("Non-existent company", "GET", "companies/nonexistent", 404, parse_json=False)
+        )
 
-def main():
+async def main():
     print("🚀 Starting H1B Job Board API Tests")
     print("=" * 50)
     
     tester = H1BJobBoardTester()
     
-    # Run all test suites
-    tester.test_health_endpoints()
-    tester.test_seed_endpoint()  # Seed first to ensure data exists
-    tester.test_job_sync_endpoints()  # Test new sync features
-    tester.test_external_jobs()  # Test external job features
-    tester.test_jobs_endpoints()
-    tester.test_companies_endpoints()
-    tester.test_auth_endpoints()
-    tester.test_error_cases()
+    # Endpoints are resolved against the client's pre-parsed base URL rather than
+    # formatting and parsing a full URL string for every request; HTTP/2 lets the
+    # concurrent suites multiplex over one connection to the preview host
+    async with httpx.AsyncClient(
+        base_url=tester.base_url,
+        http2=True,
+        timeout=REQUEST_TIMEOUT,
+        limits=httpx.Limits(max_connections=20)
+    ) as client:
+        tester.client = client
+        
+        # Run all test suites; seeding and sync finish before the read-only suites start
+        await asyncio.gather(
+            tester.test_health_endpoints(),
+            tester.test_seed_endpoint()  # Seed first to ensure data exists
+        )
+        await tester.test_job_sync_endpoints()  # Test new sync features
+        await asyncio.gather(
+            tester.test_external_jobs(),  # Test external job features
+            tester.test_jobs_endpoints(),
+            tester.test_companies_endpoints(),
+            tester.test_auth_endpoints(),
+            tester.test_error_cases()
+        )
     
     # Print final results
     print("\n" + "=" * 50)
@@ -225,4 +329,4 @@ def main():
     return 0 if tester.tests_passed == tester.tests_run else 1
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(asyncio.run(main()))
\ No newline at end of file
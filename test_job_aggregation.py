@@ -2,200 +2,262 @@
 """
 Focused test for H1B Job Board real-time job aggregation features
 """
-import requests
-import time
+import asyncio
+import functools
+import httpx
+import orjson
 import sys
 
 BASE_URL = "https://job-fetch-app.preview.emergentagent.com/api"
 
-def test_job_sync_status():
+# Seconds to wait for the API before a test fails
+REQUEST_TIMEOUT = 10.0
+
+# Tests in flight at once, to stay within the preview host's rate limits
+MAX_CONCURRENT_TESTS = 5
+
+# Endpoints whose responses are fetched once and shared across the tests
+SYNC_STATUS_PATH = "/jobs/sync/status"
+JOBS_LIST_PATH = "/jobs?limit=100"
+
+# Known H1B sponsors that external jobs are expected to come from
+H1B_COMPANIES = frozenset({
+    'GitLab', 'Stripe', 'Airbnb', 'Lyft', 'Dropbox', 'Coinbase',
+    'Robinhood', 'Instacart', 'Reddit', 'Databricks', 'MongoDB',
+    'Figma', 'Airtable', 'Asana', 'Cloudflare'
+})
+
+# Shared by every test; set in main() before the tests are scheduled
+semaphore = None
+
+def buffered(test):
+    """Collect a test's output and print it in one write, so concurrent tests don't interleave"""
+    @functools.wraps(test)
+    async def wrapper(*args):
+        lines = []
+        try:
+            return await test(lines.append, *args)
+        finally:
+            print("\n".join(lines))
+    return wrapper
+
+def partition_jobs(jobs):
+    """Split jobs into external, internal and Greenhouse lists plus external companies, in one pass"""
+    external_jobs, internal_jobs, greenhouse_jobs = [], [], []
+    companies = set()
+    for job in jobs:
+        if job.get('is_external'):
+            external_jobs.append(job)
+            companies.add(job.get('company_name', ''))
+            if job.get('source') == 'greenhouse':
+                greenhouse_jobs.append(job)
+        else:
+            internal_jobs.append(job)
+    return external_jobs, internal_jobs, greenhouse_jobs, companies
+
+def parse_json(response):
+    """Decode a response body with orjson, straight from the raw bytes"""
+    return orjson.loads(response.content)
+
+async def fetch_fixture(client, path):
+    """Fetch and decode one shared response, or report why and return None so the tests fail on their own"""
+    try:
+        response = await client.get(path)
+    except httpx.HTTPError as e:
+        print(f"\n❌ FAILED to fetch {path} - Error: {e}")
+        return None
+    
+    # HTTP/1.1 here means the host didn't negotiate HTTP/2 and requests aren't multiplexed
+    print(f"\n🔗 {path} over {response.http_version}")
+    if response.status_code != 200:
+        print(f"❌ FAILED to fetch {path} - Status: {response.status_code}")
+        return None
+    
+    try:
+        return parse_json(response)
+    except orjson.JSONDecodeError:
+        print(f"❌ FAILED to fetch {path} - Response is not JSON: {response.text[:200]}")
+        return None
+
+async def fetch_fixtures(client):
+    """Fetch the sync status and jobs list once; every test reads from these instead of re-fetching"""
+    async with semaphore:
+        return await asyncio.gather(
+            fetch_fixture(client, SYNC_STATUS_PATH),
+            fetch_fixture(client, JOBS_LIST_PATH)
+        )
+
+@buffered
+async def test_job_sync_status(log, data):
     """Test job sync status endpoint"""
-    print("🔍 Testing Job Sync Status Endpoint...")
-    
-    response = requests.get(f"{BASE_URL}/jobs/sync/status")
+    log("\n🔍 Testing Job Sync Status Endpoint...")
     
-    if response.status_code != 200:
-        print(f"❌ FAILED - Status: {response.status_code}")
+    if data is None:
+        log("❌ FAILED - No sync status")
         return False
     
-    data = response.json()
-    print(f"✅ PASSED - Status: {response.status_code}")
-    print(f"   Total external jobs: {data.get('total_external_jobs', 0)}")
-    print(f"   Greenhouse jobs: {data.get('greenhouse_jobs', 0)}")
-    print(f"   Arbeitnow jobs: {data.get('arbeitnow_jobs', 0)}")
-    print(f"   Internal jobs: {data.get('internal_jobs', 0)}")
-    print(f"   Last synced: {data.get('last_synced', 'Never')}")
-    print(f"   Scheduler running: {data.get('running', False)}")
+    log("✅ PASSED - Status: 200")
+    log(f"   Total external jobs: {data.get('total_external_jobs', 0)}")
+    log(f"   Greenhouse jobs: {data.get('greenhouse_jobs', 0)}")
+    log(f"   Arbeitnow jobs: {data.get('arbeitnow_jobs', 0)}")
+    log(f"   Internal jobs: {data.get('internal_jobs', 0)}")
+    log(f"   Last synced: {data.get('last_synced', 'Never')}")
+    log(f"   Scheduler running: {data.get('running', False)}")
     
     # Verify expected fields
     required_fields = ['total_external_jobs', 'greenhouse_jobs', 'arbeitnow_jobs', 'status']
     missing_fields = [field for field in required_fields if field not in data]
     
     if missing_fields:
-        print(f"❌ Missing required fields: {missing_fields}")
+        log(f"❌ Missing required fields: {missing_fields}")
         return False
     
     return True
 
-def test_manual_sync_trigger():
+@buffered
+async def test_manual_sync_trigger(log, client):
     """Test manual sync trigger endpoint"""
-    print("\n🔍 Testing Manual Sync Trigger...")
+    log("\n🔍 Testing Manual Sync Trigger...")
     
-    response = requests.post(f"{BASE_URL}/jobs/sync/trigger")
+    async with semaphore:
+        response = await client.post("/jobs/sync/trigger")
     
     if response.status_code != 200:
-        print(f"❌ FAILED - Status: {response.status_code}")
+        log(f"❌ FAILED - Status: {response.status_code}")
         return False
     
-    data = response.json()
-    print(f"✅ PASSED - Status: {response.status_code}")
-    print(f"   Message: {data.get('message', 'No message')}")
-    print(f"   Status: {data.get('status', 'Unknown')}")
+    data = parse_json(response)
+    log(f"✅ PASSED - Status: {response.status_code}")
+    log(f"   Message: {data.get('message', 'No message')}")
+    log(f"   Status: {data.get('status', 'Unknown')}")
     
     return True
 
-def test_external_jobs_api():
+@buffered
+async def test_external_jobs_api(log, data):
     """Test jobs API with external jobs"""
-    print("\n🔍 Testing Jobs API with External Jobs...")
+    log("\n🔍 Testing Jobs API with External Jobs...")
     
-    response = requests.get(f"{BASE_URL}/jobs?limit=100")
-    
-    if response.status_code != 200:
-        print(f"❌ FAILED - Status: {response.status_code}")
+    if data is None:
+        log("❌ FAILED - No jobs list")
         return False
     
-    data = response.json()
     jobs = data.get('jobs', [])
     
-    print(f"✅ PASSED - Status: {response.status_code}")
-    print(f"   Total jobs returned: {len(jobs)}")
+    log("✅ PASSED - Status: 200")
+    log(f"   Total jobs returned: {len(jobs)}")
     
     # Analyze job types
-    external_jobs = [job for job in jobs if job.get('is_external')]
-    internal_jobs = [job for job in jobs if not job.get('is_external')]
-    greenhouse_jobs = [job for job in external_jobs if job.get('source') == 'greenhouse']
+    external_jobs, internal_jobs, greenhouse_jobs, _ = partition_jobs(jobs)
     
-    print(f"   External jobs: {len(external_jobs)}")
-    print(f"   Internal jobs: {len(internal_jobs)}")
-    print(f"   Greenhouse jobs: {len(greenhouse_jobs)}")
+    log(f"   External jobs: {len(external_jobs)}")
+    log(f"   Internal jobs: {len(internal_jobs)}")
+    log(f"   Greenhouse jobs: {len(greenhouse_jobs)}")
     
     # Test external job properties
     if external_jobs:
         ext_job = external_jobs[0]
-        print(f"   Sample external job:")
-        print(f"     ID: {ext_job.get('job_id', 'N/A')}")
-        print(f"     Source: {ext_job.get('source', 'N/A')}")
-        print(f"     Company: {ext_job.get('company_name', 'N/A')}")
-        print(f"     Has external_url: {'external_url' in ext_job}")
-        print(f"     Is external: {ext_job.get('is_external', False)}")
+        log(f"   Sample external job:")
+        log(f"     ID: {ext_job.get('job_id', 'N/A')}")
+        log(f"     Source: {ext_job.get('source', 'N/A')}")
+        log(f"     Company: {ext_job.get('company_name', 'N/A')}")
+        log(f"     Has external_url: {'external_url' in ext_job}")
+        log(f"     Is external: {ext_job.get('is_external', False)}")
         
         # Verify required fields for external jobs
         required_ext_fields = ['source', 'external_url', 'is_external']
         missing_ext_fields = [field for field in required_ext_fields if field not in ext_job]
         
         if missing_ext_fields:
-            print(f"❌ External job missing fields: {missing_ext_fields}")
+            log(f"❌ External job missing fields: {missing_ext_fields}")
             return False
     else:
-        print("⚠️  No external jobs found")
+        log("⚠️  No external jobs found")
     
     return True
 
-def test_external_job_detail():
+@buffered
+async def test_external_job_detail(log, client, data):
     """Test job detail endpoint with external job"""
-    print("\n🔍 Testing External Job Detail...")
-    
-    # First get a list of jobs to find an external one
-    response = requests.get(f"{BASE_URL}/jobs?limit=50")
-    if response.status_code != 200:
-        print(f"❌ FAILED to get jobs list - Status: {response.status_code}")
+    log("\n🔍 Testing External Job Detail...")
+    # The shared jobs list supplies the external job, so only the detail call hits the API
+    if data is None:
+        log("❌ FAILED to get jobs list")
         return False
     
-    jobs = response.json().get('jobs', [])
-    external_jobs = [job for job in jobs if job.get('is_external')]
+    jobs = data.get('jobs', [])
+    external_jobs, _, greenhouse_jobs, _ = partition_jobs(jobs)
     
     if not external_jobs:
-        print("⚠️  No external jobs found for detail testing")
+        log("⚠️  No external jobs found for detail testing")
         return True
     
     # Test with a Greenhouse job if available
-    greenhouse_jobs = [job for job in external_jobs if job.get('source') == 'greenhouse']
     test_job = greenhouse_jobs[0] if greenhouse_jobs else external_jobs[0]
     
     job_id = test_job['job_id']
-    print(f"   Testing job ID: {job_id}")
+    log(f"   Testing job ID: {job_id}")
     
-    response = requests.get(f"{BASE_URL}/jobs/{job_id}")
+    async with semaphore:
+        response = await client.get(f"/jobs/{job_id}")
     
     if response.status_code != 200:
-        print(f"❌ FAILED - Status: {response.status_code}")
+        log(f"❌ FAILED - Status: {response.status_code}")
         return False
     
-    job_detail = response.json()
-    print(f"✅ PASSED - Status: {response.status_code}")
-    print(f"   Job title: {job_detail.get('job_title', 'N/A')}")
-    print(f"   Company: {job_detail.get('company_name', 'N/A')}")
-    print(f"   Source: {job_detail.get('source', 'N/A')}")
-    print(f"   External URL: {job_detail.get('external_url', 'N/A')}")
-    print(f"   Is external: {job_detail.get('is_external', False)}")
+    job_detail = parse_json(response)
+    log(f"✅ PASSED - Status: {response.status_code}")
+    log(f"   Job title: {job_detail.get('job_title', 'N/A')}")
+    log(f"   Company: {job_detail.get('company_name', 'N/A')}")
+    log(f"   Source: {job_detail.get('source', 'N/A')}")
+    log(f"   External URL: {job_detail.get('external_url', 'N/A')}")
+    log(f"   Is external: {job_detail.get('is_external', False)}")
     
     # Verify Greenhouse job ID format
     if job_detail.get('source') == 'greenhouse':
         if job_id.startswith('gh_'):
-            print(f"   ✅ Greenhouse job ID format correct")
+            log(f"   ✅ Greenhouse job ID format correct")
         else:
-            print(f"   ❌ Greenhouse job ID format incorrect: {job_id}")
+            log(f"   ❌ Greenhouse job ID format incorrect: {job_id}")
             return False
     
     return True
 
-def test_h1b_company_filtering():
+@buffered
+async def test_h1b_company_filtering(log, data):
     """Test that only H1B-sponsoring companies appear"""
-    print("\n🔍 Testing H1B Company Filtering...")
-    
-    response = requests.get(f"{BASE_URL}/jobs?limit=100")
-    if response.status_code != 200:
-        print(f"❌ FAILED - Status: {response.status_code}")
+    log("\n🔍 Testing H1B Company Filtering...")
+    if data is None:
+        log("❌ FAILED - No jobs list")
         return False
     
-    jobs = response.json().get('jobs', [])
-    external_jobs = [job for job in jobs if job.get('is_external')]
+    jobs = data.get('jobs', [])
+    external_jobs, _, _, companies_found = partition_jobs(jobs)
     
     if not external_jobs:
-        print("⚠️  No external jobs to test company filtering")
+        log("⚠️  No external jobs to test company filtering")
         return True
     
-    # Check that all external jobs are from known H1B sponsors
-    h1b_companies = {
-        'GitLab', 'Stripe', 'Airbnb', 'Lyft', 'Dropbox', 'Coinbase', 
-        'Robinhood', 'Instacart', 'Reddit', 'Databricks', 'MongoDB', 
-        'Figma', 'Airtable', 'Asana', 'Cloudflare'
-    }
-    
-    companies_found = set()
-    for job in external_jobs:
-        company = job.get('company_name', '')
-        companies_found.add(company)
-    
-    print(f"   External job companies found: {sorted(companies_found)}")
+    log(f"   External job companies found: {sorted(companies_found)}")
     
     # Check if companies are H1B sponsors
-    non_h1b_companies = companies_found - h1b_companies
+    non_h1b_companies = companies_found - H1B_COMPANIES
     if non_h1b_companies:
-        print(f"⚠️  Found non-H1B companies: {non_h1b_companies}")
+        log(f"⚠️  Found non-H1B companies: {non_h1b_companies}")
     else:
-        print(f"   ✅ All companies are H1B sponsors")
+        log(f"   ✅ All companies are H1B sponsors")
     
     return True
 
-def main():
+async def main():
     """Run all tests"""
+    global semaphore
     print("🚀 Testing H1B Job Board Real-Time Job Aggregation")
     print("=" * 60)
     
     tests = [
-        test_job_sync_status,
         test_manual_sync_trigger,
+        test_job_sync_status,
         test_external_jobs_api,
         test_external_job_detail,
         test_h1b_company_filtering
@@ -203,15 +265,34 @@ def main():
     
     passed = 0
     total = len(tests)
-    
-    for test in tests:
-        try:
-            if test():
-                passed += 1
-            else:
-                print(f"❌ Test {test.__name__} failed")
-        except Exception as e:
-            print(f"❌ Test {test.__name__} error: {e}")
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_TESTS)
+    
+    # One HTTP/2 client multiplexes every test's requests over a single TLS connection
+    async with httpx.AsyncClient(
+        base_url=BASE_URL,
+        http2=True,
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+        timeout=REQUEST_TIMEOUT
+    ) as client:
+        # The trigger is the only test that changes server state, so it runs
+        # alone before the fixtures are fetched; the read-only tests then run together
+        results = await asyncio.gather(test_manual_sync_trigger(client), return_exceptions=True)
+        status_data, jobs_data = await fetch_fixtures(client)
+        results += await asyncio.gather(
+            test_job_sync_status(status_data),
+            test_external_jobs_api(jobs_data),
+            test_external_job_detail(client, jobs_data),
+            test_h1b_company_filtering(jobs_data),
+            return_exceptions=True
+        )
+    
+    for test, result in zip(tests, results):
+        if isinstance(result, Exception):
+            print(f"❌ Test {test.__name__} error: {result}")
+        elif result:
+            passed += 1
+        else:
+            print(f"❌ Test {test.__name__} failed")
     
     print("\n" + "=" * 60)
     print(f"📊 RESULTS: {passed}/{total} tests passed")
@@ -225,4 +306,4 @@ def main():
         return 1
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(asyncio.run(main()))